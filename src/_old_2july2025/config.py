@@ -10,8 +10,6 @@ import yaml
 import datetime
 import sys
 import csv
-import glob
-from pathlib import Path
 
 
 def load_yaml(yaml_path):
@@ -155,6 +153,10 @@ TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 # --- Logging Configuration ---
 LOG_FILE = os.path.join(DIRECTORIES["logs"], f"processing_{PROJECT_NAME}.log")
 
+# --- Tracking Files ---
+# One tracking file per project, placed directly in the project directory (BASE_DIRECTORY)
+TRACKING_FILE = os.path.join(DIRECTORIES["base"], f"status_{PROJECT_ID}.csv")
+
 # --- Helper Functions ---
 
 def create_directories():
@@ -177,7 +179,7 @@ def create_directories():
 def ensure_parent_directory(filepath):
     """Ensure the parent directory of a file exists."""
     parent_dir = os.path.dirname(filepath)
-    if parent_dir and not os.path.exists(parent_dir): # Check if exists before creating
+    if parent_dir:
         try:
             os.makedirs(parent_dir, exist_ok=True)
         except OSError as e:
@@ -185,9 +187,7 @@ def ensure_parent_directory(filepath):
 
 def get_tracking_file(model_id=None): # model_id is not used here anymore
     """Get tracking file path for the project (now directly in project dir)."""
-    # Use project ID in the filename to create a unique tracking file per project
-    # Place it directly in the project directory (BASE_DIRECTORY)
-    return os.path.join(DIRECTORIES["base"], f"status_{PROJECT_ID}.csv")
+    return TRACKING_FILE
 
 def get_tracking_files():
     """Get list of all tracking files for this project (always returns one path)."""
@@ -408,9 +408,10 @@ def update_tracking(model_id, data):
     # Update values in the model's row
     updated = False
     current_row = rows[model_row_index]
+    col_indices = {col_name: i for i, col_name in enumerate(header)}
     for key, value in data.items():
         try:
-            col_index = header.index(key)
+            col_index = col_indices[key]
             # Ensure row has enough columns, pad with empty strings if necessary
             while len(current_row) <= col_index:
                 current_row.append("")
@@ -418,7 +419,7 @@ def update_tracking(model_id, data):
             if current_row[col_index] != str(value):
                  current_row[col_index] = str(value) # Ensure value is string
                  updated = True
-        except ValueError:
+        except KeyError:
             # FIXED: No more auto-column adding! This was causing CSV corruption.
             # If column doesn't exist, FAIL FAST instead of silently corrupting the CSV.
             print(f"ERROR: Column '{key}' does not exist in tracking file {tracking_file}")
@@ -442,6 +443,80 @@ def update_tracking(model_id, data):
     return tracking_file
 
 
+def batch_update_tracking(updates):
+    """
+    Update several models with one read and one write of the tracking file.
+
+    Args:
+        updates (dict): Mapping of model ID to a dict of column name -> value
+
+    Returns:
+        bool: True if the tracking file holds the updates, False if the update was aborted
+    """
+    tracking_file = get_tracking_file()
+    if not updates:
+        return True
+
+    try:
+        with open(tracking_file, 'r', newline='') as csvfile:
+            rows = list(csv.reader(csvfile))
+    except Exception as e:
+        print(f"Error reading tracking file {tracking_file} before batch update: {e}. Update aborted.")
+        return False
+
+    if not rows:
+        print(f"Error: Tracking file {tracking_file} has no header. Update aborted.")
+        return False
+    header = rows[0]
+
+    # Find the Model ID column index
+    try:
+        id_index = header.index("Model ID")
+    except ValueError:
+        print(f"Error: 'Model ID' column missing in header of {tracking_file}. Update aborted.")
+        return False
+
+    # FIXED: No more auto-column adding! Fail fast on unknown columns before touching any row.
+    unknown_columns = sorted({key for data in updates.values() for key in data if key not in header})
+    if unknown_columns:
+        print(f"ERROR: Column(s) {unknown_columns} do not exist in tracking file {tracking_file}")
+        print(f"Available columns: {header}")
+        print(f"ABORTING to prevent CSV corruption. Fix the script to use only existing columns.")
+        return False
+
+    row_indices = {}
+    for i, row in enumerate(rows[1:], start=1):
+        if row and len(row) > id_index:
+            row_indices.setdefault(row[id_index], i)
+
+    updated = False
+    for model_id, data in updates.items():
+        if model_id not in row_indices:
+            print(f"Warning: Model '{model_id}' not found in tracking file. Skipping.")
+            continue
+        current_row = rows[row_indices[model_id]]
+        for key, value in data.items():
+            col_index = header.index(key)
+            # Ensure row has enough columns, pad with empty strings if necessary
+            while len(current_row) <= col_index:
+                current_row.append("")
+            if current_row[col_index] != str(value):
+                current_row[col_index] = str(value)
+                updated = True
+
+    # Write updated data only if changes were made
+    if updated:
+        try:
+            with open(tracking_file, 'w', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerows(rows)
+        except Exception as e:
+            print(f"Error writing batch updates to tracking file {tracking_file}: {e}")
+            return False
+
+    return True
+
+
 def get_current_timestamp():
     """Get current timestamp in MDY HMS format."""
     return datetime.datetime.now().strftime("%m/%d/%Y %H:%M:%S")
@@ -15,6 +15,7 @@ Usage:
 import os
 import sys
 import argparse
+import functools
 
 # Add the src directory to the path so we can import config
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -22,13 +23,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from config import (
     get_tracking_file,
     get_transect_status,
-    mark_step_for_reprocessing,
-    update_tracking,
+    batch_update_tracking,
     get_current_timestamp
 )
 
-def parse_arguments():
-    """Parse command line arguments."""
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the command line parser once and reuse it."""
     parser = argparse.ArgumentParser(description='Selective reset via CSV tracking flags')
     parser.add_argument('project_dir', nargs='?', help='Path to the project directory')
     parser.add_argument('--model-ids', required=True, help='Comma-separated list of model IDs to reset')
@@ -36,7 +37,11 @@ def parse_arguments():
     parser.add_argument('--dry-run', action='store_true', help='Show what would be done without making changes')
     parser.add_argument('--force', action='store_true', help='Skip confirmation prompts')
     
-    return parser.parse_args()
+    return parser
+
+def parse_arguments():
+    """Parse command line arguments."""
+    return _build_parser().parse_args()
 
 def get_project_directory(project_dir=None):
     """Get and validate project directory."""
@@ -77,7 +82,7 @@ def selective_reset_csv(model_ids, steps, dry_run=False):
         return False
     
     print("📋 RESET PLAN:")
-    for model_id in existing_models.keys():
+    for model_id in existing_models:
         current_status = existing_models[model_id].get("Status", "Unknown")
         print(f"  📍 {model_id} (current: {current_status})")
         for step in steps:
@@ -90,25 +95,29 @@ def selective_reset_csv(model_ids, steps, dry_run=False):
     
     print(f"\n🔄 EXECUTING SELECTIVE RESET...")
     
-    reset_count = 0
-    for model_id in existing_models.keys():
-        try:
-            # Reset each specified step
-            for step in steps:
-                mark_step_for_reprocessing(model_id, step)
-                print(f"  ✅ Reset Step {step} for {model_id}")
-                reset_count += 1
-            
-            # Update overall status
-            reset_steps_text = ", ".join([f"Step {s}" for s in steps])
-            update_tracking(model_id, {
-                "Status": f"Reset for reprocessing: {reset_steps_text}",
-                "Notes": f"Selective reset on {get_current_timestamp()}: {reset_steps_text}"
-            })
-            
-        except Exception as e:
-            print(f"  ❌ Error resetting {model_id}: {e}")
+    # Collect every model's changes, then rewrite the tracking file once
+    reset_steps_text = ", ".join(f"Step {s}" for s in steps)
+    timestamp = get_current_timestamp()
+    updates = {}
+    for model_id in existing_models:
+        model_updates = {f"Step {step} complete": "FALSE" for step in steps}
+        model_updates["Status"] = f"Reset for reprocessing: {reset_steps_text}"
+        model_updates["Notes"] = f"Selective reset on {timestamp}: {reset_steps_text}"
+        updates[model_id] = model_updates
+    
+    try:
+        if not batch_update_tracking(updates):
+            print("  ❌ Tracking file was not updated; no steps were reset")
             return False
+    except Exception as e:
+        print(f"  ❌ Error resetting models: {e}")
+        return False
+    
+    reset_count = 0
+    for model_id in updates:
+        for step in steps:
+            print(f"  ✅ Reset Step {step} for {model_id}")
+            reset_count += 1
     
     print(f"\n🎯 SELECTIVE RESET COMPLETE!")
     print(f"✅ Reset {reset_count} step flags across {len(existing_models)} models")
@@ -9,16 +9,42 @@ import os
 import yaml
 import datetime
 import sys
+import time
+import threading
+import atexit
 import csv
-import glob
-from pathlib import Path
+import functools
+import types
+
+# Use the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Top-level sections analysis_params.yaml must have, in the order errors report them
+REQUIRED_SECTIONS = ('project', 'processing') # Removed 'directories'
+
+# Processing parameters each step expects; missing ones only warn
+REQUIRED_PROCESSING = (
+    'frames_per_transect',                    # Step 0
+    'chunk_size', 'use_gpu', 'metashape',     # Step 1
+    'chunk_management',                       # Step 2
+    'model_processing',                       # Step 3
+    'final_exports'                           # Step 4
+)
+
+# Set forms for the membership tests
+_REQUIRED_SECTION_SET = frozenset(REQUIRED_SECTIONS)
+_REQUIRED_PROCESSING_SET = frozenset(REQUIRED_PROCESSING)
 
 
 def load_yaml(yaml_path):
     """Load and validate YAML file."""
     try:
-        with open(yaml_path, 'r') as f:
-            params = yaml.safe_load(f)
+        # Hand libyaml the raw bytes; it detects the encoding itself
+        with open(yaml_path, 'rb') as f:
+            params = yaml.load(f, Loader=YamlLoader)
     except FileNotFoundError:
         raise FileNotFoundError(f"Could not find analysis_params.yaml at: {yaml_path}")
     except Exception as e:
@@ -34,23 +60,15 @@ def load_yaml(yaml_path):
             raise e
     
     # Validate required sections
-    required_sections = ['project', 'processing'] # Removed 'directories'
-    for section in required_sections:
-        if section not in params:
-            raise ValueError(f"Missing required section '{section}' in {yaml_path}")
+    missing_sections = _REQUIRED_SECTION_SET - params.keys()
+    if missing_sections:
+        section = next(name for name in REQUIRED_SECTIONS if name in missing_sections)
+        raise ValueError(f"Missing required section '{section}' in {yaml_path}")
     
     # Validate required processing parameters for all steps
-    required_processing = [
-        'frames_per_transect',                    # Step 0
-        'chunk_size', 'use_gpu', 'metashape',     # Step 1
-        'chunk_management',                       # Step 2
-        'model_processing',                       # Step 3
-        'final_exports'                           # Step 4
-    ]
-    
-    for param in required_processing:
-        if param not in params['processing']:
-            print(f"Warning: Missing recommended parameter '{param}' under 'processing' in {yaml_path}")
+    missing_params = _REQUIRED_PROCESSING_SET - params['processing'].keys()
+    for param in (name for name in REQUIRED_PROCESSING if name in missing_params):
+        print(f"Warning: Missing recommended parameter '{param}' under 'processing' in {yaml_path}")
     
     return params
 
@@ -89,259 +107,537 @@ def get_dir_name(path):
     return os.path.basename(path.rstrip('/'))
 
 # --- Configuration Loading ---
-
-# Get the project directory path
-PROJECT_DIR = get_project_dir_path()
-
-# Construct path to YAML file within the project directory
-YAML_PATH = os.path.join(PROJECT_DIR, "analysis_params.yaml")
-
-# Load YAML configuration
-PARAMS = load_yaml(YAML_PATH)
-
-# Derive project name and ID from the directory path
-PROJECT_NAME = get_dir_name(PROJECT_DIR)
-PROJECT_ID = PROJECT_NAME # Use the derived name as the ID
-
-# --- Directory Definitions (Derived from PROJECT_DIR) ---
-BASE_DIRECTORY = PROJECT_DIR
-PROCESSING_DIRECTORY = os.path.join(PROJECT_DIR, "processing")
-OUTPUT_DIRECTORY = os.path.join(PROJECT_DIR, "output")
-VIDEO_SOURCE_DIRECTORY = os.path.join(PROJECT_DIR, "video_source")
-
-# Define standard subdirectories relative to the project
-DIRECTORIES = {
-    "base": BASE_DIRECTORY,
-    "processing_root": PROCESSING_DIRECTORY,
-    "output_root": OUTPUT_DIRECTORY,
-    "video_source": VIDEO_SOURCE_DIRECTORY, # Added video source here
-    "frames": os.path.join(PROCESSING_DIRECTORY, "frames"),
-    "logs": os.path.join(OUTPUT_DIRECTORY, "logs"),
-    "psxraw": os.path.join(PROCESSING_DIRECTORY, "psxraw"),
-    "orthomosaics": os.path.join(OUTPUT_DIRECTORY, "orthomosaics"),
-    "models": os.path.join(OUTPUT_DIRECTORY, "models"),
-    "reports": os.path.join(OUTPUT_DIRECTORY, "reports"), # Added reports directory
-    "psx_output": os.path.join(OUTPUT_DIRECTORY, "psx"), # Renamed from psx_consolidated
-    "final_outputs": os.path.join(OUTPUT_DIRECTORY, "final")
-    # Removed adobe_presets, metashape_presets, scripts, config
-}
-
-# --- Processing Parameters ---
-
-# Number of frames to extract per transect
-FRAMES_PER_TRANSECT = PARAMS['processing']['frames_per_transect']
-
-# Project metadata from YAML
-PROJECT_NOTES = PARAMS['project'].get('notes', '')
-
-# Metashape processing parameters
-METASHAPE_DEFAULTS = PARAMS['processing']['metashape']['defaults']
-CHUNK_SIZE = PARAMS['processing']['chunk_size']
-USE_GPU = PARAMS['processing']['use_gpu']
-MAX_CHUNKS_PER_PSX = PARAMS['processing'].get('max_chunks_per_psx', 5)
+# Project settings are resolved on first use rather than at import, so importing this
+# module never prompts for a project directory or parses the YAML by itself. Names in
+# _LAZY_SETTINGS are published as module globals by _load_config(), and module-level
+# __getattr__ (PEP 562) triggers it for `from config import ...` and `config.NAME`.
+
+_LAZY_SETTINGS = frozenset({
+    "PROJECT_DIR", "YAML_PATH", "PARAMS", "PROJECT_NAME", "PROJECT_ID",
+    "BASE_DIRECTORY", "PROCESSING_DIRECTORY", "OUTPUT_DIRECTORY", "VIDEO_SOURCE_DIRECTORY",
+    "DIRECTORIES", "CREATABLE_DIRECTORIES", "FRAMES_PER_TRANSECT", "FFMPEG_HWACCEL",
+    "EXTRACTION_WORKERS", "FRAME_FORMAT", "PROJECT_NOTES", "METASHAPE_DEFAULTS",
+    "CHUNK_SIZE", "USE_GPU", "MAX_CHUNKS_PER_PSX",
+    "TRACKING_FLUSH_EVERY", "TRACKING_FLUSH_SECONDS", "TIMESTAMP", "LOG_FILE",
+    "TRACKING_FILE", "TRACKING_JOURNAL",
+})
 
 # --- Static Paths (Relative to Script Location or Assumed Structure) ---
 # Get the directory where this config.py script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO_ROOT = os.path.dirname(SCRIPT_DIR) # Assumes src is one level down from root
 
-# Define preset paths relative to repository root
-DIRECTORIES["adobe_presets"] = os.path.join(REPO_ROOT, "presets/lightroom")
-DIRECTORIES["metashape_presets"] = os.path.join(REPO_ROOT, "presets/metashape") # Changed from premiere
-
-# --- Runtime Variables ---
-TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-
-# --- Logging Configuration ---
-LOG_FILE = os.path.join(DIRECTORIES["logs"], f"processing_{PROJECT_NAME}.log")
+def _config_loaded():
+    """Whether the project settings have been resolved yet."""
+    return "PARAMS" in globals()
+
+def _load_config():
+    """Resolve the project directory and YAML once, and publish the derived settings."""
+    if _config_loaded():
+        return
+
+    # Get the project directory path
+    PROJECT_DIR = get_project_dir_path()
+
+    # Construct path to YAML file within the project directory
+    YAML_PATH = os.path.join(PROJECT_DIR, "analysis_params.yaml")
+
+    # Load YAML configuration
+    PARAMS = load_yaml(YAML_PATH)
+
+    # Derive project name and ID from the directory path
+    PROJECT_NAME = get_dir_name(PROJECT_DIR)
+    PROJECT_ID = PROJECT_NAME # Use the derived name as the ID
+
+    # --- Directory Definitions (Derived from PROJECT_DIR) ---
+    BASE_DIRECTORY = PROJECT_DIR
+    PROCESSING_DIRECTORY = os.path.join(PROJECT_DIR, "processing")
+    OUTPUT_DIRECTORY = os.path.join(PROJECT_DIR, "output")
+    VIDEO_SOURCE_DIRECTORY = os.path.join(PROJECT_DIR, "video_source")
+
+    # Define standard subdirectories relative to the project
+    DIRECTORIES = {
+        "base": BASE_DIRECTORY,
+        "processing_root": PROCESSING_DIRECTORY,
+        "output_root": OUTPUT_DIRECTORY,
+        "video_source": VIDEO_SOURCE_DIRECTORY, # Added video source here
+        "frames": os.path.join(PROCESSING_DIRECTORY, "frames"),
+        "logs": os.path.join(OUTPUT_DIRECTORY, "logs"),
+        "psxraw": os.path.join(PROCESSING_DIRECTORY, "psxraw"),
+        "orthomosaics": os.path.join(OUTPUT_DIRECTORY, "orthomosaics"),
+        "models": os.path.join(OUTPUT_DIRECTORY, "models"),
+        "reports": os.path.join(OUTPUT_DIRECTORY, "reports"), # Added reports directory
+        "psx_output": os.path.join(OUTPUT_DIRECTORY, "psx"), # Renamed from psx_consolidated
+        "final_outputs": os.path.join(OUTPUT_DIRECTORY, "final"),
+        # Preset paths relative to repository root
+        "adobe_presets": os.path.join(REPO_ROOT, "presets/lightroom"),
+        "metashape_presets": os.path.join(REPO_ROOT, "presets/metashape") # Changed from premiere
+    }
+
+    # Directories create_directories() makes: those inside the project (processing/output
+    # subfolders), excluding final_outputs from automatic creation initially; shallowest first
+    CREATABLE_DIRECTORIES = tuple(sorted(
+        {os.path.normpath(dir_path) for dir_name, dir_path in DIRECTORIES.items()
+         if dir_path.startswith(PROJECT_DIR) and dir_name != "final_outputs"},
+        key=len))
+
+    # The paths are fixed for the run; hand out a read-only view
+    DIRECTORIES = types.MappingProxyType(DIRECTORIES)
+
+    # --- Processing Parameters ---
+    processing = PARAMS['processing']
+
+    # Number of frames to extract per transect
+    FRAMES_PER_TRANSECT = processing['frames_per_transect']
+
+    # FFmpeg hardware decoder for frame extraction: VideoToolbox on macOS, otherwise let
+    # FFmpeg pick an available one (e.g. 'cuda' for NVDEC on NVIDIA machines)
+    FFMPEG_HWACCEL = processing.get('ffmpeg_hwaccel', 'videotoolbox' if sys.platform == 'darwin' else 'auto')
+
+    # Number of transects step0 extracts concurrently (each runs its own FFmpeg process)
+    EXTRACTION_WORKERS = max(1, processing.get('extraction_workers', 1))
+
+    # Image format for extracted frames: uncompressed 'tiff', or 'jpg' for far less disk I/O
+    FRAME_FORMAT = str(processing.get('frame_format', 'tiff')).lower()
+    if FRAME_FORMAT not in ('tiff', 'jpg'):
+        raise ValueError(f"processing.frame_format must be 'tiff' or 'jpg', got '{FRAME_FORMAT}' in {YAML_PATH}")
+
+    # Project metadata from YAML
+    PROJECT_NOTES = PARAMS['project'].get('notes', '')
+
+    # Metashape processing parameters
+    METASHAPE_DEFAULTS = processing['metashape']['defaults']
+    CHUNK_SIZE = processing['chunk_size']
+    USE_GPU = processing['use_gpu']
+    MAX_CHUNKS_PER_PSX = processing.get('max_chunks_per_psx', 5)
+
+    # Number of models with queued tracking updates before they are written to disk
+    TRACKING_FLUSH_EVERY = max(1, processing.get('tracking_flush_every', 5))
+    # Seconds after which queued tracking updates are written even if fewer models are pending
+    TRACKING_FLUSH_SECONDS = processing.get('tracking_flush_seconds', 60)
+
+    # --- Runtime Variables ---
+    TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # --- Logging Configuration ---
+    LOG_FILE = os.path.join(DIRECTORIES["logs"], f"processing_{PROJECT_NAME}.log")
+
+    # --- Tracking Files ---
+    # One tracking file per project, placed directly in the project directory (BASE_DIRECTORY)
+    TRACKING_FILE = os.path.join(DIRECTORIES["base"], f"status_{PROJECT_ID}.csv")
+    TRACKING_JOURNAL = os.path.join(DIRECTORIES["base"], f"status_{PROJECT_ID}_journal.csv")
+
+    # Publish everything at once, so a failure above leaves nothing half-loaded
+    settings = locals()
+    globals().update({name: settings[name] for name in _LAZY_SETTINGS})
+
+def __getattr__(name):
+    """Resolve project settings on first access (PEP 562)."""
+    if name in _LAZY_SETTINGS:
+        _load_config()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Tracking file columns, in order (**FIXED: Simplified headers to prevent CSV corruption**)
+TRACKING_HEADERS = (
+    "Model ID", "Status", "Step 0 complete", "Video Length (s)", "Total Video Frames",
+    "Frames Extracted", "Video Source", "Extraction Timestamp", "Step 0 start time",
+    "Step 0 end time", "Step 0 processing time (s)", "Frames directory", "Step 1 complete",
+    "Step 1 start time", "Step 1 end time", "Step 1 processing time (s)", "Aligned cameras",
+    "Total cameras", "PSX file", "Report file", "Step 1 error time", "Step 2 complete",
+    "Step 2 site", "Step 2 consolidation time", "Step 3 complete", "Step 3 scale method",
+    "Step 3 scale applied", "Step 3 ortho exported", "Step 3 model exported",
+    "Step 3 processing time", "Step 4 complete", "Step 4 web published", "Sketchfab URL",
+    "Step 4 high-res exported", "Step 4 processing time", "Notes"
+)
+TRACKING_HEADER_INDEX = {col_name: i for i, col_name in enumerate(TRACKING_HEADERS)}
 
 # --- Helper Functions ---
 
+# Tracking CSVs are read and written whole, so use one large buffer instead of many 8 KiB writes
+TRACKING_IO_BUFFER = 1 << 20
+
+def _open_tracking(path, mode):
+    """Open a tracking CSV for the csv module (newline='') with a large buffer."""
+    return open(path, mode, newline='', encoding='utf-8', buffering=TRACKING_IO_BUFFER)
+
+def _write_tracking_rows(tracking_file, rows, sync=False):
+    """
+    Replace the tracking file with the given rows atomically.
+
+    Rows go to a sibling temp file that is then renamed over the original, so a
+    crash mid-write never leaves a truncated CSV. Only one process writes the
+    tracking file at a time, so a fixed temp name is enough.
+
+    Args:
+        tracking_file (str): Path of the tracking CSV
+        rows (list): Header row followed by data rows
+        sync (bool): fsync the temp file before it replaces the original
+    """
+    tmp_file = tracking_file + ".tmp"
+    with _open_tracking(tmp_file, 'w') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerows(rows)
+        if sync:
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
+    os.replace(tmp_file, tracking_file)
+
+# Directories known to exist (with their parents), so repeat requests skip makedirs' stat walk
+_created_dirs = set()
+
+def _remember_dir(dir_path):
+    """Record an existing directory and all its parents."""
+    while dir_path not in _created_dirs and dir_path != os.path.dirname(dir_path):
+        _created_dirs.add(dir_path)
+        dir_path = os.path.dirname(dir_path)
+
+def _makedirs(dir_path):
+    """Create a directory and its parents once per process."""
+    dir_path = os.path.normpath(dir_path)
+    if dir_path in _created_dirs:
+        return
+    # One stat for the common already-exists case; makedirs would stat the parent and attempt a mkdir
+    if not os.path.isdir(dir_path):
+        os.makedirs(dir_path, exist_ok=True)
+    _remember_dir(dir_path)
+
 def create_directories():
     """Create required subdirectories within the project folder."""
-    # Only create directories defined within the project (processing/output subfolders)
-    for dir_name, dir_path in DIRECTORIES.items():
-        if dir_path.startswith(PROJECT_DIR): # Check if path is within the project base
-             # Exclude final_outputs from automatic creation initially
-            if dir_name == "final_outputs":
-                continue
-                
-             # Ensure the specific paths for logs and reports are created
-            # Simplify: Just attempt to create all other project-relative dirs
-            # if dir_name in ["logs", "reports", "frames", "psxraw", "orthomosaics", "models", "psx_output"]:
+    _load_config()
+    # The project folder was checked when the config loaded
+    _remember_dir(os.path.normpath(PROJECT_DIR))
+
+    # Learn which directories already exist by listing each parent once instead of
+    # stat'ing every path; shallow paths come first, so parents made here are known
+    listed = {}
+    for dir_path in CREATABLE_DIRECTORIES:
+        if dir_path in _created_dirs:
+            continue
+        parent = os.path.dirname(dir_path)
+        if parent not in listed:
             try:
-                os.makedirs(dir_path, exist_ok=True)
-            except OSError as e:
-                 print(f"Warning: Could not create directory {dir_path}: {e}")
+                with os.scandir(parent) as it:
+                    listed[parent] = {entry.name for entry in it if entry.is_dir()}
+            except OSError:
+                listed[parent] = set()
+        if os.path.basename(dir_path) in listed[parent]:
+            _remember_dir(dir_path)
+            continue
+        try:
+            _makedirs(dir_path)
+        except OSError as e:
+            print(f"Warning: Could not create directory {dir_path}: {e}")
+
+def ensure_directory(dir_path):
+    """Ensure a directory exists, touching the filesystem only the first time it is seen."""
+    _makedirs(dir_path)
 
 def ensure_parent_directory(filepath):
     """Ensure the parent directory of a file exists."""
     parent_dir = os.path.dirname(filepath)
-    if parent_dir and not os.path.exists(parent_dir): # Check if exists before creating
+    if parent_dir:
         try:
-            os.makedirs(parent_dir, exist_ok=True)
+            _makedirs(parent_dir)
         except OSError as e:
             print(f"Warning: Could not create parent directory {parent_dir} for {filepath}: {e}")
 
 def get_tracking_file(model_id=None): # model_id is not used here anymore
     """Get tracking file path for the project (now directly in project dir)."""
-    # Use project ID in the filename to create a unique tracking file per project
-    # Place it directly in the project directory (BASE_DIRECTORY)
-    return os.path.join(DIRECTORIES["base"], f"status_{PROJECT_ID}.csv")
+    _load_config()
+    return TRACKING_FILE
+
+def get_tracking_journal():
+    """Get path of the append-only journal of tracking updates not yet written to the tracking file."""
+    _load_config()
+    return TRACKING_JOURNAL
 
 def get_tracking_files():
     """Get list of all tracking files for this project (always returns one path)."""
+    # Fold in any journaled updates so readers of the CSV see them
+    flush_tracking()
     tracking_file = get_tracking_file()
     return [tracking_file] if os.path.exists(tracking_file) else []
 
+# Last formatted time per format string, as (time slot, text)
+_now_cache = {}
+
+def _now_string(fmt, period):
+    """Format the current local time with fmt, re-running strftime at most once per period seconds."""
+    slot = int(time.time() // period)
+    cached = _now_cache.get(fmt)
+    if cached is None or cached[0] != slot:
+        cached = (slot, datetime.datetime.fromtimestamp(slot * period).strftime(fmt))
+        _now_cache[fmt] = cached
+    return cached[1]
+
+def new_tracking_row(headers, model_id, col_indices=TRACKING_HEADER_INDEX):
+    """
+    Build an empty tracking row for a model, marked as initialized.
+
+    Args:
+        headers (list): Columns of the tracking file the row is for
+        model_id (str): Model ID to put in the row
+        col_indices (dict): Column name -> index for headers (defaults to the standard header)
+    """
+    notes = f"Tracking initialized {_now_string('%Y-%m-%d %H:%M', 60)}"
+    new_row = [""] * len(headers)
+    try:
+        new_row[col_indices["Model ID"]] = model_id
+        new_row[col_indices["Status"]] = "Initialized"
+        new_row[col_indices["Notes"]] = notes
+    except (KeyError, IndexError) as e:
+        print(f"Error preparing new row data: {e}")
+        # Fallback if columns not found or index issue
+        new_row = [model_id, "Initialized"] + [""] * (len(headers) - 3) + [notes]
+        if len(new_row) < len(headers): # Pad if necessary
+             new_row.extend([""] * (len(headers) - len(new_row)))
+        elif len(new_row) > len(headers): # Truncate if necessary
+             new_row = new_row[:len(headers)]
+    return new_row
+
+# Tracking state (_pending, the journal handle, caches) is shared by every thread in the
+# process; public tracking functions hold this lock so steps can run work on threads
+_tracking_lock = threading.RLock()
+
+def _with_tracking_lock(func):
+    """Run the decorated tracking function while holding _tracking_lock."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _tracking_lock:
+            return func(*args, **kwargs)
+    return wrapper
+
+@_with_tracking_lock
 def initialize_tracking(model_id):
     """Initialize tracking CSV file if not exists, and add a row for the model."""
+    _initialize_tracking_rows(model_id)
+    return get_tracking_file()
+
+def _initialize_tracking_rows(model_id):
+    """Initialize the tracking file for model_id and return its rows ([] if it could not be written)."""
     tracking_file = get_tracking_file()
     
     # Ensure parent directory exists (should be project dir, usually exists)
     ensure_parent_directory(tracking_file)
     
-    # **FIXED: Simplified headers to prevent CSV corruption**
-    headers = ["Model ID", "Status", "Step 0 complete", "Video Length (s)", "Total Video Frames", "Frames Extracted", "Video Source", "Extraction Timestamp", "Step 0 start time", "Step 0 end time", "Step 0 processing time (s)", "Frames directory", "Step 1 complete", "Step 1 start time", "Step 1 end time", "Step 1 processing time (s)", "Aligned cameras", "Total cameras", "PSX file", "Report file", "Step 1 error time", "Step 2 complete", "Step 2 site", "Step 2 consolidation time", "Step 3 complete", "Step 3 scale method", "Step 3 scale applied", "Step 3 ortho exported", "Step 3 model exported", "Step 3 processing time", "Step 4 complete", "Step 4 web published", "Sketchfab URL", "Step 4 high-res exported", "Step 4 processing time", "Notes"]
+    headers = list(TRACKING_HEADERS)
 
-    file_exists = os.path.exists(tracking_file)
+    file_exists = True
     rows = []
     current_header = []
     
-    if file_exists:
-        try:
-            with open(tracking_file, 'r', newline='') as csvfile:
-                reader = csv.reader(csvfile)
-                rows = list(reader)
-                if rows:
-                    current_header = rows[0]
-                    # **FIXED: Detect corrupted CSV (header split across lines)**
-                    if len(rows) > 1 and len(rows[1]) == len(current_header) and rows[1][0] == "Model ID":
-                        print(f"🔧 DETECTED CORRUPTED CSV: Header split across lines in {tracking_file}. Fixing...")
-                        file_exists = False  # Force recreation
-        except Exception as e:
-            print(f"Warning: Could not read existing tracking file {tracking_file}: {e}. Will recreate.")
-            file_exists = False # Treat as non-existent if unreadable
+    try:
+        with _open_tracking(tracking_file, 'r') as csvfile:
+            reader = csv.reader(csvfile)
+            rows = list(reader)
+            if rows:
+                current_header = rows[0]
+                # **FIXED: Detect corrupted CSV (header split across lines)**
+                if len(rows) > 1 and len(rows[1]) == len(current_header) and rows[1][0] == "Model ID":
+                    print(f"🔧 DETECTED CORRUPTED CSV: Header split across lines in {tracking_file}. Fixing...")
+                    file_exists = False  # Force recreation
+    except FileNotFoundError:
+        file_exists = False
+    except Exception as e:
+        print(f"Warning: Could not read existing tracking file {tracking_file}: {e}. Will recreate.")
+        file_exists = False # Treat as non-existent if unreadable
 
     # Check if file needs header or if header is incomplete/incorrect
     needs_header = not file_exists or not rows or current_header != headers
-    
     if needs_header:
-        try:
-            with open(tracking_file, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(headers)
-            rows = [headers] # Reset rows to just the header
-            current_header = headers
-            print(f"Initialized/updated tracking file: {tracking_file}")
-        except Exception as e:
-            print(f"Error: Could not write headers to tracking file {tracking_file}: {e}")
-            return tracking_file # Return path even if write failed
+        rows = [headers] # Reset rows to just the header
 
-    # Check if model_id already exists in the file
-    model_exists = False
-    if len(rows) > 1: # Check only if there are data rows
-        try:
-            id_index = current_header.index("Model ID")
-            for row in rows[1:]:
-                if row and len(row) > id_index and row[id_index] == model_id:
-                    model_exists = True
-                    break
-        except ValueError:
-            print(f"Warning: 'Model ID' column not found in {tracking_file}.")
-            # If header is broken, we might have already rewritten it, but double check
-            if current_header != headers:
-                 print("Attempting to fix header again.")
-                 # This case should be rare if header check above worked
-                 try:
-                     with open(tracking_file, 'w', newline='') as csvfile:
-                         writer = csv.writer(csvfile)
-                         writer.writerow(headers)
-                     rows = [headers]
-                     current_header = headers
-                 except Exception as e:
-                     print(f"Error: Could not fix header for {tracking_file}: {e}")
-
-    # If model doesn't exist, add it
+    # Check if model_id already exists in the file (the header is the expected one by now)
+    id_index = TRACKING_HEADER_INDEX["Model ID"]
+    model_exists = any(row and len(row) > id_index and row[id_index] == model_id for row in rows[1:])
     if not model_exists:
-        new_row = [""] * len(headers)
-        try:
-            id_index = headers.index("Model ID")
-            new_row[id_index] = model_id
-            status_index = headers.index("Status")
-            new_row[status_index] = "Initialized"
-            notes_index = headers.index("Notes")
-            new_row[notes_index] = f"Tracking initialized {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        except (ValueError, IndexError) as e:
-            print(f"Error preparing new row data: {e}")
-            # Fallback if columns not found or index issue
-            new_row = [model_id, "Initialized"] + [""] * (len(headers) - 3) + [f"Tracking initialized {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}"]
-            if len(new_row) < len(headers): # Pad if necessary
-                 new_row.extend([""] * (len(headers) - len(new_row)))
-            elif len(new_row) > len(headers): # Truncate if necessary
-                 new_row = new_row[:len(headers)]
-
-        # Append the new row to the existing data (or just after header if no data)
-        rows.append(new_row)
-        
-        # Write the updated data
+        rows.append(new_tracking_row(headers, model_id))
+
+    # Header and new row go out in a single write; nothing to do if both were already there
+    if needs_header or not model_exists:
         try:
-            with open(tracking_file, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerows(rows)
-            print(f"Added model '{model_id}' to tracking file.")
+            _write_tracking_rows(tracking_file, rows)
         except Exception as e:
-            print(f"Error: Could not write new model row to {tracking_file}: {e}")
-            
-    return tracking_file
-
+            print(f"Error: Could not write tracking file {tracking_file}: {e}")
+            return []
+        if needs_header:
+            print(f"Initialized/updated tracking file: {tracking_file}")
+        if not model_exists:
+            print(f"Added model '{model_id}' to tracking file.")
+    
+    _invalidate_status_cache()
+    return rows
+
+
+# Tracking updates not yet written to the tracking file, keyed by model ID
+_pending = {}
+_journal_replayed = False
+_last_flush = time.monotonic()
+# Journal file and csv writer kept open between updates, so each update costs one write
+_journal = None
+# When set, tracking updates go to this callable and the tracking files are never written
+_tracking_sink = None
+
+def redirect_tracking(sink):
+    """
+    Send tracking updates to sink(model_id, data) instead of the tracking file.
+
+    For worker processes whose parent owns the tracking file: the journal is
+    neither replayed nor written, and nothing is flushed at exit.
+    """
+    global _tracking_sink
+    _tracking_sink = sink
+    atexit.unregister(_flush_tracking_at_exit)
+
+def _journal_writer():
+    """Return the csv writer for the tracking journal, opening it for append on first use."""
+    global _journal
+    if _journal is None:
+        journal = open(get_tracking_journal(), 'a', newline='', encoding='utf-8')
+        _journal = (journal, csv.writer(journal))
+    return _journal[1]
+
+def _close_journal():
+    """Close the shared journal handle, if open."""
+    global _journal
+    if _journal is not None:
+        _journal[0].close()
+        _journal = None
+
+def _replay_tracking_journal():
+    """Queue updates left in the journal by a run that exited before writing them."""
+    global _journal_replayed
+    if _journal_replayed or _tracking_sink is not None:
+        return
+    _journal_replayed = True
+
+    journal_file = get_tracking_journal()
+    try:
+        with open(journal_file, 'r', newline='', encoding='utf-8') as journal:
+            for row in csv.reader(journal):
+                if len(row) >= 3:
+                    model_id, key, value = row[:3]
+                    _pending.setdefault(model_id, {})[key] = value
+        print(f"Recovered unsaved tracking updates from {journal_file}")
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        print(f"Warning: Could not read tracking journal {journal_file}: {e}")
 
+@_with_tracking_lock
 def update_tracking(model_id, data):
-    """Update tracking file with new data for the specified model."""
+    """
+    Record new tracking data for the specified model.
+
+    Each update is appended to the tracking journal (one line per field) and
+    merged in memory; flush_tracking() writes the merged rows into the tracking
+    file once TRACKING_FLUSH_EVERY models are pending, TRACKING_FLUSH_SECONDS have
+    passed since the last write, or when the process exits.
+    """
+    global _journal
+    if _tracking_sink is not None:
+        _tracking_sink(model_id, data)
+        return get_tracking_file()
+    _replay_tracking_journal()
+    values = {key: str(value) for key, value in data.items()} # Ensure values are strings
+
+    # Nothing to journal or rewrite if the model already holds these values (e.g. a rerun)
+    current = _pending.get(model_id, {})
+    if not all(current.get(key) == value for key, value in values.items()):
+        recorded = (_load_tracking_status() or {}).get(model_id, {})
+        current = {**recorded, **current}
+    if current and all(current.get(key) == value for key, value in values.items()):
+        return get_tracking_file()
+
+    _pending.setdefault(model_id, {}).update(values)
+    timestamp = _now_string("%Y-%m-%d %H:%M:%S", 1)
+    try:
+        writer = _journal_writer()
+        writer.writerows([model_id, key, value, timestamp] for key, value in values.items())
+        # Hand the lines to the OS so they survive a crash of this process
+        _journal[0].flush()
+    except Exception as e:
+        print(f"Warning: Could not append to tracking journal {get_tracking_journal()}: {e}")
+        _journal = None # Reopen on the next update
+
+    if (len(_pending) >= TRACKING_FLUSH_EVERY
+            or time.monotonic() - _last_flush >= TRACKING_FLUSH_SECONDS):
+        flush_tracking()
+
+    return get_tracking_file()
+
+
+def _read_tracking_rows(model_id):
+    """Read all rows of the tracking file, initializing it for model_id if missing or empty."""
     tracking_file = get_tracking_file()
-    
-    # Initialize tracking if file doesn't exist or is empty
-    if not os.path.exists(tracking_file):
-        initialize_tracking(model_id) # This ensures header exists
-    
+
     rows = []
-    header = []
     try:
-        with open(tracking_file, 'r', newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            rows = list(reader)
-            if rows:
-                header = rows[0]
-            else: # If file exists but is empty
-                 initialize_tracking(model_id) # Re-initialize to get header
-                 # Reread after initialization
-                 with open(tracking_file, 'r', newline='') as csvfile:
-                      reader = csv.reader(csvfile)
-                      rows = list(reader)
-                      if rows:
-                           header = rows[0]
-
+        with _open_tracking(tracking_file, 'r') as csvfile:
+            rows = list(csv.reader(csvfile))
+    except FileNotFoundError:
+        pass
     except Exception as e:
         print(f"Error reading tracking file {tracking_file} before update: {e}. Attempting to initialize.")
-        initialize_tracking(model_id) # Attempt to create/fix it
-        # Reread after initialization attempt
-        try:
-            with open(tracking_file, 'r', newline='') as csvfile:
-                 reader = csv.reader(csvfile)
-                 rows = list(reader)
-                 if rows:
-                     header = rows[0]
-        except Exception as e2:
-             print(f"Error: Could not read tracking file even after initialization: {e2}. Update aborted.")
-             return tracking_file # Return path, but update failed
+    if rows:
+        return rows
+
+    # Missing, empty or unreadable: initialize it (this ensures the header exists); the
+    # rows just written are returned directly, so there is no need to read the file again
+    rows = _initialize_tracking_rows(model_id)
+    if not rows:
+        print(f"Error: Could not initialize tracking file {tracking_file}. Update aborted.")
+    return rows
+
+
+# Rows and model row index from the last flush, valid while the file's (mtime, size) is unchanged
+_rows_cache_key = None
+_rows_cache = None
+
+def _tracking_file_key():
+    """Return (mtime_ns, size) of the tracking file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(get_tracking_file())
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+@_with_tracking_lock
+def flush_tracking(sync=False):
+    """
+    Compact all journaled tracking updates into the tracking file in a single pass.
+
+    Args:
+        sync (bool): fsync the new tracking file before it replaces the old one
+    """
+    global _rows_cache_key, _rows_cache, _last_flush
+    tracking_file = get_tracking_file()
+    if _tracking_sink is not None:
+        return tracking_file
+    _last_flush = time.monotonic()
+    _replay_tracking_journal()
+    if not _pending:
+        return tracking_file
+
+    # Snapshot only; the updates stay queued until they are safely in the tracking file
+    updates = dict(_pending)
+    first_model_id = next(iter(updates))
+
+    # Reuse the rows and row index from the last flush if the file is unchanged
+    cache_key = _tracking_file_key()
+    if cache_key is not None and cache_key == _rows_cache_key:
+        rows, row_indices = _rows_cache
+        header = rows[0]
+    else:
+        rows = _read_tracking_rows(first_model_id)
+        header = rows[0] if rows else []
+        row_indices = None
 
     if not header:
         print(f"Error: Tracking file {tracking_file} has no header. Update aborted.")
         return tracking_file
 
-    model_row_index = -1
-    id_index = -1
-    
     # Find the Model ID column index
     try:
         id_index = header.index("Model ID")
@@ -349,57 +645,45 @@ def update_tracking(model_id, data):
         print(f"Error: 'Model ID' column missing in header of {tracking_file}. Update aborted.")
         return tracking_file
     
-    # Find the row for this model_id
-    for i, row in enumerate(rows):
-        if i == 0: continue # Skip header row
-        if row and len(row) > id_index and row[id_index] == model_id:
-            model_row_index = i
-            break
-            
-    # If model doesn't exist in the file, add a new row using initialize logic
-    if model_row_index == -1:
-        print(f"Model '{model_id}' not found in tracking file. Adding it now.")
-        initialize_tracking(model_id) # Add the row
-        # Reread file to get the newly added row
-        try:
-             with open(tracking_file, 'r', newline='') as csvfile:
-                  reader = csv.reader(csvfile)
-                  rows = list(reader)
-                  if rows:
-                      header = rows[0] # Reconfirm header
-                  # Find the new row index
-                  for i, row in enumerate(rows):
-                      if i == 0: continue
-                      if row and len(row) > id_index and row[id_index] == model_id:
-                           model_row_index = i
-                           break
-        except Exception as e:
-             print(f"Error rereading tracking file after adding model: {e}. Update may be incomplete.")
-             
-        if model_row_index == -1: # If still not found after adding
-             print(f"Error: Failed to add or find model '{model_id}' row after initialization. Update aborted.")
-             return tracking_file
+    # Map each model ID to its row, and each column name to its index
+    if row_indices is None:
+        row_indices = {}
+        for i, row in enumerate(rows):
+            if i == 0: continue # Skip header row
+            if row and len(row) > id_index:
+                row_indices.setdefault(row[id_index], i)
+    col_indices = {col_name: i for i, col_name in enumerate(header)}
 
-    # Update values in the model's row
     updated = False
-    current_row = rows[model_row_index]
-    for key, value in data.items():
-        try:
-            col_index = header.index(key)
+    for model_id, data in updates.items():
+        # If model doesn't exist in the file, add a new row (even if the update is rejected
+        # below, so the model still shows up in the tracking file)
+        if model_id not in row_indices:
+            print(f"Model '{model_id}' not found in tracking file. Adding it now.")
+            rows.append(new_tracking_row(header, model_id, col_indices))
+            row_indices[model_id] = len(rows) - 1
+            updated = True
+
+        # FIXED: No more auto-column adding! This was causing CSV corruption.
+        # If a column doesn't exist, FAIL FAST instead of silently corrupting the CSV.
+        unknown_columns = [key for key in data if key not in col_indices]
+        if unknown_columns:
+            print(f"ERROR: Column(s) {unknown_columns} do not exist in tracking file {tracking_file}")
+            print(f"Available columns: {header}")
+            print(f"ABORTING update for '{model_id}' to prevent CSV corruption. Fix the script to use only existing columns.")
+            continue
+
+        # Update values in the model's row
+        current_row = rows[row_indices[model_id]]
+        for key, value in data.items():
+            col_index = col_indices[key]
             # Ensure row has enough columns, pad with empty strings if necessary
             while len(current_row) <= col_index:
                 current_row.append("")
             # Update only if value is different
-            if current_row[col_index] != str(value):
-                 current_row[col_index] = str(value) # Ensure value is string
+            if current_row[col_index] != value:
+                 current_row[col_index] = value
                  updated = True
-        except ValueError:
-            # FIXED: No more auto-column adding! This was causing CSV corruption.
-            # If column doesn't exist, FAIL FAST instead of silently corrupting the CSV.
-            print(f"ERROR: Column '{key}' does not exist in tracking file {tracking_file}")
-            print(f"Available columns: {header}")
-            print(f"ABORTING to prevent CSV corruption. Fix the script to use only existing columns.")
-            return tracking_file
             
     # Write updated data only if changes were made
     if updated:
@@ -407,70 +691,145 @@ def update_tracking(model_id, data):
             # Ensure parent directory exists (redundant check, but safe)
             ensure_parent_directory(tracking_file)
             
-            with open(tracking_file, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerows(rows)
-            # print(f"Updated tracking data for model '{model_id}'.") # Reduce verbosity
+            _write_tracking_rows(tracking_file, rows, sync=sync)
+            _invalidate_status_cache()
         except Exception as e:
+            # Keep the updates queued and the journal on disk so they are retried
             print(f"Error writing updates to tracking file {tracking_file}: {e}")
+            _rows_cache_key = None
+            return tracking_file
+
+    # The rows in memory now match the file; keep them for the next flush
+    _rows_cache_key = _tracking_file_key()
+    _rows_cache = (rows, row_indices)
+    for model_id in updates:
+        _pending.pop(model_id, None)
+
+    # The journal can go once everything in it is in the tracking file
+    if not _pending:
+        _close_journal()
+        try:
+            os.remove(get_tracking_journal())
+        except FileNotFoundError:
+            pass
     
     return tracking_file
 
+def _flush_tracking_at_exit():
+    """Write queued tracking updates at exit, synced to disk once; no-op if config was never used."""
+    if _config_loaded():
+        flush_tracking(sync=True)
 
-def get_transect_status(model_id):
-    """Get the current status for a model from the tracking file."""
+# Write any queued tracking updates when the interpreter exits
+atexit.register(_flush_tracking_at_exit)
+
+
+# Parsed tracking file, reused while the file's (mtime, size) is unchanged
+_status_cache_key = None
+_status_cache = {}
+
+def _load_tracking_status():
+    """
+    Parse the tracking file into a mapping of model ID to status dict.
+
+    The parse is memoized against the file's modification time and size, so
+    repeated status lookups only re-read the file after it changes.
+
+    Returns:
+        dict or None: Status per model ID, or None if the CSV is corrupted
+    """
+    global _status_cache_key, _status_cache
     tracking_file = get_tracking_file()
-    
-    if not os.path.exists(tracking_file):
+
+    try:
+        stat = os.stat(tracking_file)
+    except FileNotFoundError:
         return {} # Return empty dict if file doesn't exist
-    
+
+    cache_key = (stat.st_mtime_ns, stat.st_size)
+    if cache_key == _status_cache_key:
+        return _status_cache
+
+    all_status = {}
     try:
-        with open(tracking_file, 'r', newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            rows = list(reader)
+        with _open_tracking(tracking_file, 'r') as csvfile:
+            # Short rows get "" for missing columns; extra cells land under the None key
+            reader = csv.DictReader(csvfile, restval="")
+            header = reader.fieldnames
+            if header and "Model ID" not in header:
+                print(f"Warning: 'Model ID' column missing in header of {tracking_file} during status check.")
+                return {}
+            for i, row in enumerate(reader):
+                model_id = row["Model ID"]
+                # **FIXED: Detect and handle corrupted CSV** (header repeated as the first data row)
+                if i == 0 and model_id == "Model ID":
+                    return None
+                if model_id not in all_status:
+                    row.pop(None, None)
+                    all_status[model_id] = row
     except Exception as e:
         print(f"Error reading tracking file {tracking_file} for status check: {e}")
         return {}
 
-    if len(rows) < 2: # Need header + at least one data row
-        return {} 
-    
-    header = rows[0]
-    
-    # **FIXED: Detect and handle corrupted CSV**
-    if len(rows) > 1 and len(rows[1]) == len(header) and rows[1][0] == "Model ID":
+    _status_cache_key = cache_key
+    _status_cache = all_status
+    return all_status
+
+
+def _invalidate_status_cache():
+    """Force the next status lookup to re-read the tracking file."""
+    global _status_cache_key
+    _status_cache_key = None
+
+
+@_with_tracking_lock
+def get_transect_status(model_id):
+    """Get the current status for a model, including tracking updates not yet flushed."""
+    _replay_tracking_journal()
+    all_status = _load_tracking_status()
+    if all_status is None:
         print(f"🔧 CORRUPTED CSV detected in get_transect_status. Recreating...")
         initialize_tracking(model_id)
         return {"Status": "Initialized"}  # Return basic status
-    
-    id_index = -1
-    
-    # Find the Model ID column index
-    try:
-        id_index = header.index("Model ID")
-    except ValueError:
-        print(f"Warning: 'Model ID' column missing in header of {tracking_file} during status check.")
-        return {}
-        
-    # Find the row for this model_id
-    for row in rows[1:]:
-        if row and len(row) > id_index and row[id_index] == model_id:
-            # Create dictionary of column names to values
-            status = {}
-            for i, col_name in enumerate(header):
-                 # Ensure row has a value for this column, default to empty string
-                 status[col_name] = row[i] if i < len(row) else ""
-            return status
-            
-    # If we get here, the model wasn't found
-    return {}
-
-
-# Create all directories on import
-create_directories()
-print(f"Configuration loaded for project: {PROJECT_NAME} in {PROJECT_DIR}")
-print(f"Tracking file location: {get_tracking_file()}")
-# Optionally print all defined directories
-# print("Defined directories:")
-# for key, path in DIRECTORIES.items():
-#     print(f"  {key}: {path}") 
\ No newline at end of file
+
+    status = dict(all_status.get(model_id, {}))
+    status.update(_pending.get(model_id, {}))
+    return status
+
+
+@_with_tracking_lock
+def get_all_transect_status():
+    """Get the current status of every model in one read of the tracking file.
+
+    Returns:
+        dict: Mapping of model ID to its status dict, including unflushed updates
+    """
+    _replay_tracking_journal()
+    stored_status = _load_tracking_status()
+    if stored_status is None:
+        print(f"🔧 CORRUPTED CSV detected in get_all_transect_status. Ignoring stored status.")
+        stored_status = {}
+
+    all_status = {model_id: dict(status) for model_id, status in stored_status.items()}
+
+    # Overlay tracking updates not yet written to disk
+    for model_id, data in _pending.items():
+        all_status.setdefault(model_id, {}).update(data)
+
+    return all_status
+
+
+def init_project():
+    """
+    Create the project directories and report the loaded configuration.
+
+    Step scripts call this once at startup, before logging writes into the
+    logs directory; utilities that only read configuration values skip it.
+    """
+    create_directories()
+    print(f"Configuration loaded for project: {PROJECT_NAME} in {PROJECT_DIR}")
+    print(f"Tracking file location: {get_tracking_file()}")
+    # Optionally print all defined directories
+    # print("Defined directories:")
+    # for key, path in DIRECTORIES.items():
+    #     print(f"  {key}: {path}")
@@ -16,12 +16,16 @@ from config import (
     PARAMS,
     update_tracking,
     get_transect_status,
-    get_tracking_files
+    get_tracking_files,
+    init_project
 )
 import datetime
 import math
 import pandas as pd
 
+# Create project directories before logging writes into them
+init_project()
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,9 +20,13 @@ from config import (
     USE_GPU,
     PARAMS,
     update_tracking,
-    get_transect_status
+    get_transect_status,
+    init_project
 )
 
+# Create project directories before logging writes into them
+init_project()
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
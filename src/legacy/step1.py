@@ -47,31 +47,32 @@ try:
             psx_dir = os.path.dirname(psx_path)
             
             # Update CSV with this PSX info if it's not already there
-            for index, row in df.iterrows():
-                if pd.isna(row.get('psxraw_path')) or pd.isna(row.get('psxraw_name')):
-                    df.at[index, 'psxraw_path'] = psx_dir
-                    df.at[index, 'psxraw_name'] = psx_name
+            psx_columns = ['psxraw_path', 'psxraw_name']
+            df = df.reindex(columns=df.columns.union(psx_columns, sort=False))
+            df.loc[df[psx_columns].isna().any(axis=1), psx_columns] = [psx_dir, psx_name]
             
             # Check if any rows have extracted frames but no photos added to PSX
-            for index, row in df.iterrows():
-                if row.get('extract_frames_complete') == 'Yes' and pd.isna(row.get('step1_complete')):
-                    frames_dir = row.get('frames_dir')
-                    if frames_dir and os.path.exists(frames_dir):
-                        # Create a new chunk for this transect
-                        transect_id = row.get('transect_id')
-                        if transect_id:
-                            chunk = doc.addChunk()
-                            chunk.label = transect_id
-                            
-                            # Add photos to the chunk
-                            photo_files = []
-                            for ext in ['.tif', '.tiff', '.TIF', '.TIFF']:
-                                photo_files.extend([os.path.join(frames_dir, f) for f in os.listdir(frames_dir) if f.endswith(ext)])
-                            
-                            if photo_files:
-                                chunk.addPhotos(photo_files)
-                                print(f"Added {len(photo_files)} photos for transect {transect_id}")
-            
+            no_value = pd.Series(None, index=df.index, dtype=object)
+            pending = df[(df.get('extract_frames_complete', no_value) == 'Yes')
+                         & df.get('step1_complete', no_value).isna()]
+            for _, row in pending.iterrows():
+                frames_dir = row.get('frames_dir')
+                if frames_dir and os.path.exists(frames_dir):
+                    # Create a new chunk for this transect
+                    transect_id = row.get('transect_id')
+                    if transect_id:
+                        chunk = doc.addChunk()
+                        chunk.label = transect_id
+                        
+                        # Add photos to the chunk
+                        with os.scandir(frames_dir) as entries:
+                            photo_files = [entry.path for entry in entries
+                                           if entry.name.lower().endswith(('.tif', '.tiff')) and entry.is_file()]
+                        
+                        if photo_files:
+                            chunk.addPhotos(photo_files)
+                            print(f"Added {len(photo_files)} photos for transect {transect_id}")
+        
             # Save the document with added photos
             doc.save()
             
@@ -82,12 +83,11 @@ except Exception as e:
     # Continue with the script even if CSV operations fail
     pass
 
-for chunk in doc.chunks:
-    
+def process_chunk(chunk):
+    """Run the full step1 reconstruction on one chunk and export its report."""
     #align photos and make sparse point cloud
     chunk.matchPhotos(downscale = 1, keypoint_limit = 40000, tiepoint_limit = 4000, generic_preselection = True, reference_preselection = True, filter_stationary_points = False)
     chunk.alignCameras(adaptive_fitting=True)
-    doc.save()
     
     # Select cameras that were not aligned initially
     unaligned_cameras = [camera for camera in chunk.cameras if not camera.transform]
@@ -102,7 +102,7 @@ for chunk in doc.chunks:
     # Reset the region
     chunk.resetRegion()
 
-    # Save the project
+    # Save once alignment is complete; the cheap filtering below is simply redone after a failure
     doc.save()
     
     #gradual seln: reconstruction uncertainty
@@ -122,9 +122,6 @@ for chunk in doc.chunks:
     f = Metashape.TiePoints.Filter()
     f.init(chunk, Metashape.TiePoints.Filter.ProjectionAccuracy)
     f.removePoints(projacc)
-    
-    # Save the project
-    doc.save()
 
     #rotate coordinate system to bounding box
     R = chunk.region.rot     # Bounding box rotation matrix
@@ -161,18 +158,26 @@ for chunk in doc.chunks:
     chunk_label = chunk.label
     report_path = os.path.join(report_dir, f"{chunk_label}_report.pdf")
     chunk.exportReport(report_path)
-    
-    # Update tracking CSV
+
+# Tracking CSV indexed by transect_id, read on the first completed chunk and reused afterwards
+tracking_df = None
+
+def mark_step1_complete(chunk_label):
+    """Record step1 completion for a chunk in the tracking CSV."""
+    global tracking_df
     try:
-        df = pd.read_csv(config.METADATA_CSV)
-        # Find the row for this chunk
-        matching_rows = df[df['transect_id'] == chunk_label]
-        if not matching_rows.empty:
-            index = matching_rows.index[0]
-            df.at[index, 'step1_complete'] = 'Yes'
-            df.to_csv(config.METADATA_CSV, index=False)
+        if tracking_df is None:
+            tracking_df = pd.read_csv(config.METADATA_CSV).set_index('transect_id', drop=False)
+        if chunk_label in tracking_df.index:
+            tracking_df.loc[chunk_label, 'step1_complete'] = 'Yes'
+            # Still written per chunk so completed chunks survive a crash later in the run
+            tracking_df.to_csv(config.METADATA_CSV, index=False)
             print(f"Updated CSV tracking for {chunk_label}")
     except Exception as e:
         print(f"Error updating tracking CSV: {e}")
 
+for chunk in doc.chunks:
+    process_chunk(chunk)
+    mark_step1_complete(chunk.label)
+
 print("Processing completed successfully")
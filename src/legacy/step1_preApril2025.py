@@ -6,23 +6,33 @@ according to the configuration specified in analysis_params.yaml.
 """
 
 import os
+import sys
+import csv
 import logging
+import subprocess
 import Metashape
 from config import (
     DIRECTORIES,
+    PROJECT_DIR,
     PROJECT_NAME,
     METASHAPE_DEFAULTS,
     USE_GPU,
     PARAMS,
     update_tracking,
     get_transect_status,
-    get_tracking_files
+    get_tracking_files,
+    redirect_tracking,
+    init_project
 )
 import datetime
 import glob
 import math
 import pandas as pd
 import time
+import types
+
+# Create project directories before logging writes into them
+init_project()
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +47,24 @@ logging.basicConfig(
 # Maximum number of chunks per PSX file
 MAX_CHUNKS_PER_PSX = PARAMS['processing'].get('max_chunks_per_psx', 5)
 
+# Metashape enum settings resolved once at import, so a misspelled name fails before any processing
+_RESOLVED = types.SimpleNamespace(
+    depth_filter_mode=getattr(Metashape, METASHAPE_DEFAULTS["depth_filter_mode"]),
+    surface_type=getattr(Metashape, METASHAPE_DEFAULTS["surface_type"]),
+    face_count=getattr(Metashape, METASHAPE_DEFAULTS["face_count"]),
+    interpolation=getattr(Metashape, METASHAPE_DEFAULTS["interpolation"]),
+    mapping_mode=getattr(Metashape, METASHAPE_DEFAULTS["mapping_mode"]),
+    texture_type=getattr(Metashape.Model, METASHAPE_DEFAULTS["texture_type"]),
+    blending_mode=getattr(Metashape, METASHAPE_DEFAULTS["blending_mode"]),
+)
+
+# GPU devices used by process_transect; worker processes narrow this to their own device
+GPU_MASK = 1
+
+# Run as `step1_preApril2025.py <project_dir> --gpu-worker <index> <transect_id>...` to process
+# one GPU's share of the transects (used internally when several GPUs are present)
+GPU_WORKER_FLAG = "--gpu-worker"
+
 def process_transect(transect_id, doc=None, psx_path=None):
     """
     Process a single transect through initial 3D reconstruction.
@@ -70,8 +98,8 @@ def process_transect(transect_id, doc=None, psx_path=None):
         
         # Set up processing parameters
         if USE_GPU:
-            Metashape.app.gpu_mask = 1  # Use first GPU device (correct for Apple Silicon)
-            logging.info("GPU acceleration enabled for Apple Silicon")
+            Metashape.app.gpu_mask = GPU_MASK  # First GPU device by default (correct for Apple Silicon)
+            logging.info(f"GPU acceleration enabled with mask {GPU_MASK}")
         
         # Create new chunk
         chunk = doc.addChunk()
@@ -92,8 +120,6 @@ def process_transect(transect_id, doc=None, psx_path=None):
         # Add photos to chunk
         logging.info(f"Adding {len(frame_files)} photos for model {transect_id}")
         chunk.addPhotos([os.path.join(frames_dir, f) for f in frame_files])
-        if psx_path:
-            doc.save(psx_path)
         
         Metashape.app.update()
 
@@ -108,8 +134,6 @@ def process_transect(transect_id, doc=None, psx_path=None):
             filter_stationary_points=METASHAPE_DEFAULTS["filter_stationary_points"]
         )
         chunk.alignCameras(adaptive_fitting=METASHAPE_DEFAULTS["adaptive_fitting"])
-        if psx_path:
-            doc.save(psx_path)
         
         Metashape.app.update()
 
@@ -126,6 +150,8 @@ def process_transect(transect_id, doc=None, psx_path=None):
         
         # Reset the region
         chunk.resetRegion()
+        # Checkpoint only after the expensive stages (alignment, depth maps, model, texture);
+        # every save re-serializes the whole project and blocks the next stage
         if psx_path:
             doc.save(psx_path)
         
@@ -156,9 +182,6 @@ def process_transect(transect_id, doc=None, psx_path=None):
         f3.init(chunk, Metashape.TiePoints.Filter.ProjectionAccuracy)
         f3.removePoints(METASHAPE_DEFAULTS["projection_accuracy"])
         
-        if psx_path:
-            doc.save(psx_path)
-        
         Metashape.app.update()
         
         # Rotate coordinate system to bounding box
@@ -179,8 +202,6 @@ def process_transect(transect_id, doc=None, psx_path=None):
                              [     0,      0,      0,    1]])
                              
         chunk.transform.matrix = S * T.inv()  # resulting chunk transformation matrix
-        if psx_path:
-            doc.save(psx_path)
         
         Metashape.app.update()
         
@@ -188,7 +209,7 @@ def process_transect(transect_id, doc=None, psx_path=None):
         logging.info(f"Building depth maps for model {transect_id}")
         chunk.buildDepthMaps(
             downscale=METASHAPE_DEFAULTS["depth_downscale"],
-            filter_mode=getattr(Metashape, METASHAPE_DEFAULTS["depth_filter_mode"])
+            filter_mode=_RESOLVED.depth_filter_mode
         )
         if psx_path:
             doc.save(psx_path)
@@ -199,10 +220,10 @@ def process_transect(transect_id, doc=None, psx_path=None):
         logging.info(f"Building model for {transect_id}")
         chunk.buildModel(
             source_data=Metashape.DepthMapsData,
-            surface_type=getattr(Metashape, METASHAPE_DEFAULTS["surface_type"]),
-            face_count=getattr(Metashape, METASHAPE_DEFAULTS["face_count"]),
+            surface_type=_RESOLVED.surface_type,
+            face_count=_RESOLVED.face_count,
             volumetric_masks=METASHAPE_DEFAULTS["volumetric_masks"],
-            interpolation=getattr(Metashape, METASHAPE_DEFAULTS["interpolation"]),
+            interpolation=_RESOLVED.interpolation,
             vertex_colors=METASHAPE_DEFAULTS["vertex_colors"]
         )
         if psx_path:
@@ -218,20 +239,16 @@ def process_transect(transect_id, doc=None, psx_path=None):
             fix_borders=METASHAPE_DEFAULTS["fix_borders"],
             preserve_edges=METASHAPE_DEFAULTS["preserve_edges"]
         )
-        if psx_path:
-            doc.save(psx_path)
         
         Metashape.app.update()
 
         # Build UV
         logging.info(f"Building UV for model {transect_id}")
         chunk.buildUV(
-            mapping_mode=getattr(Metashape, METASHAPE_DEFAULTS["mapping_mode"]),
+            mapping_mode=_RESOLVED.mapping_mode,
             texture_size=METASHAPE_DEFAULTS["texture_size"],
             page_count=METASHAPE_DEFAULTS["page_count"]
         )
-        if psx_path:
-            doc.save(psx_path)
         
         Metashape.app.update()
 
@@ -239,8 +256,8 @@ def process_transect(transect_id, doc=None, psx_path=None):
         logging.info(f"Building texture for model {transect_id}")
         chunk.buildTexture(
             texture_size=METASHAPE_DEFAULTS["texture_size"],
-            texture_type=getattr(Metashape.Model, METASHAPE_DEFAULTS["texture_type"]),
-            blending_mode=getattr(Metashape, METASHAPE_DEFAULTS["blending_mode"]),
+            texture_type=_RESOLVED.texture_type,
+            blending_mode=_RESOLVED.blending_mode,
             fill_holes=METASHAPE_DEFAULTS["fill_holes"],
             ghosting_filter=METASHAPE_DEFAULTS["ghosting_filter"],
             enable_gpu=METASHAPE_DEFAULTS["enable_gpu"],
@@ -311,33 +328,17 @@ def create_or_update_batch_summary(batch_mapping):
     df.to_csv(summary_path, index=False)
     logging.info(f"Batch summary saved to {summary_path}")
 
-def main():
-    """Main function to process all models."""
-    # Get list of transect directories (which contain frames)
-    transect_dirs = []
-    frames_dir = DIRECTORIES["frames"]
-    if os.path.exists(frames_dir):
-        transect_dirs = [d for d in os.listdir(frames_dir) 
-                        if os.path.isdir(os.path.join(frames_dir, d))]
-    
-    if not transect_dirs:
-        logging.error(f"No model directories found in {frames_dir}")
-        return
-    
-    # Filter for transects that haven't been processed yet
-    unprocessed_transects = []
-    for transect_id in transect_dirs:
-        status = get_transect_status(transect_id)
-        if status.get("Step 1 complete", "False") != "True":
-            unprocessed_transects.append(transect_id)
-    
-    if not unprocessed_transects:
-        logging.info("All models have already been processed")
-        return
-    
-    logging.info(f"Found {len(unprocessed_transects)} models to process")
+def process_batches(transect_ids, psx_suffix=""):
+    """
+    Process transects in order, grouping up to MAX_CHUNKS_PER_PSX chunks per PSX file.
     
-    # Process transects in batches
+    Args:
+        transect_ids (list): Transects to process
+        psx_suffix (str): Appended to each PSX file name so concurrent workers never share a document
+        
+    Returns:
+        dict: Mapping of PSX batch files to the transects processed into them
+    """
     batch_mapping = {}  # Maps PSX files to contained transects
     current_batch = []
     current_doc = None
@@ -348,7 +349,7 @@ def main():
     # Create first batch immediately instead of incrementing
     batch_num = 1
     
-    for i, transect_id in enumerate(unprocessed_transects):
+    for i, transect_id in enumerate(transect_ids):
         # If we're starting a new batch or the current batch is full
         if not current_batch or len(current_batch) >= MAX_CHUNKS_PER_PSX:
             # Save previous document if it exists
@@ -371,7 +372,7 @@ def main():
             os.makedirs(DIRECTORIES["psxraw"], exist_ok=True)
             
             # Generate PSX path for this batch
-            current_psx_path = os.path.join(DIRECTORIES["psxraw"], f"psx_{batch_num}_{timestamp}.psx")
+            current_psx_path = os.path.join(DIRECTORIES["psxraw"], f"psx_{batch_num}_{timestamp}{psx_suffix}.psx")
             logging.info(f"Starting new batch {batch_num} with PSX file {current_psx_path}")
             
             # Initialize the batch mapping for this PSX file
@@ -388,22 +389,16 @@ def main():
         current_batch.append(transect_id)
         
         # Process the transect
-        logging.info(f"Processing model {transect_id} ({i+1}/{len(unprocessed_transects)})")
+        logging.info(f"Processing model {transect_id} ({i+1}/{len(transect_ids)})")
         success, updated_doc, _ = process_transect(transect_id, current_doc, current_psx_path)
         
         # Make sure we keep using the updated document reference
         if updated_doc is not None:
             current_doc = updated_doc
         
+        # process_transect has already saved the finished chunk
         if success:
             batch_mapping[current_psx_path].append(transect_id)
-            
-            # Save after each successful transect processing
-            try:
-                current_doc.save(current_psx_path)
-                logging.info(f"Saved progress to {current_psx_path} after processing {transect_id}")
-            except Exception as e:
-                logging.error(f"Error saving document to {current_psx_path}: {str(e)}")
     
     # Save final batch if it exists
     if current_doc and current_psx_path:
@@ -420,10 +415,146 @@ def main():
         except Exception as e:
             logging.error(f"Error saving final document to {current_psx_path}: {str(e)}")
     
+    return batch_mapping
+
+def worker_updates_path(gpu_index):
+    """File a GPU worker appends its tracking updates to, one (model_id, key, value) row per field."""
+    return os.path.join(DIRECTORIES["psxraw"], f"step1_gpu{gpu_index}_tracking.csv")
+
+def is_python_interpreter(executable):
+    """True for a Python interpreter, False for the Metashape application binary."""
+    return os.path.basename(executable).lower().startswith("python")
+
+def worker_command(*args):
+    """Command line that re-runs this script as a GPU worker with the given arguments."""
+    # METASHAPE_WORKER_EXECUTABLE overrides the program used to launch workers
+    executable = os.environ.get("METASHAPE_WORKER_EXECUTABLE", sys.executable)
+    script = os.path.abspath(__file__)
+    # Inside Metashape (GUI or -r), sys.executable is the Metashape binary, which runs scripts via -r
+    if is_python_interpreter(executable):
+        return [executable, script, *args]
+    return [executable, "-r", script, *args]
+
+def run_gpu_worker(gpu_index, transect_ids):
+    """
+    Worker process entry point: process a share of the transects on a single GPU.
+    
+    The parent owns the tracking file, so updates are appended to this worker's
+    updates file as each transect finishes instead; a worker that crashes part
+    way through still leaves the transects it completed on disk.
+    
+    Args:
+        gpu_index (int): Metashape GPU device index owned by this worker
+        transect_ids (list): Transects assigned to this worker
+    """
+    global GPU_MASK
+    GPU_MASK = 1 << gpu_index
+    os.makedirs(DIRECTORIES["psxraw"], exist_ok=True)
+    with open(worker_updates_path(gpu_index), 'a', newline='', encoding='utf-8') as updates:
+        writer = csv.writer(updates)
+        
+        def record_update(model_id, data):
+            writer.writerows((model_id, key, value) for key, value in data.items())
+            updates.flush()
+        
+        redirect_tracking(record_update)
+        process_batches(transect_ids, psx_suffix=f"_gpu{gpu_index}")
+
+def apply_worker_updates(updates_path, batch_mapping):
+    """
+    Apply the tracking updates recorded by a GPU worker, then remove its updates file.
+    
+    Args:
+        updates_path (str): Updates file written by run_gpu_worker
+        batch_mapping (dict): Extended with the PSX file of each completed transect
+        
+    Returns:
+        set: Transects with a recorded update
+    """
+    updates = {}
+    with open(updates_path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) >= 3:
+                model_id, key, value = row[:3]
+                updates.setdefault(model_id, {})[key] = value
+    
+    for model_id, data in updates.items():
+        update_tracking(model_id, data)
+        if data.get("Step 1 complete") == "True" and data.get("PSX file"):
+            batch_mapping.setdefault(data["PSX file"], []).append(model_id)
+    
+    os.remove(updates_path)
+    return set(updates)
+
+def main():
+    """Main function to process all models."""
+    # Get list of transect directories (which contain frames)
+    transect_dirs = []
+    frames_dir = DIRECTORIES["frames"]
+    if os.path.exists(frames_dir):
+        transect_dirs = [d for d in os.listdir(frames_dir) 
+                        if os.path.isdir(os.path.join(frames_dir, d))]
+    
+    if not transect_dirs:
+        logging.error(f"No model directories found in {frames_dir}")
+        return
+    
+    # Recover updates left by GPU workers of a run that stopped before applying them
+    batch_mapping = {}
+    for updates_path in glob.glob(worker_updates_path("*")):
+        logging.info(f"Applying tracking updates left in {updates_path}")
+        apply_worker_updates(updates_path, batch_mapping)
+    
+    # Filter for transects that haven't been processed yet
+    unprocessed_transects = []
+    for transect_id in transect_dirs:
+        status = get_transect_status(transect_id)
+        if status.get("Step 1 complete", "False") != "True":
+            unprocessed_transects.append(transect_id)
+    
+    if not unprocessed_transects:
+        logging.info("All models have already been processed")
+        return
+    
+    logging.info(f"Found {len(unprocessed_transects)} models to process")
+    
+    # Transects are independent, so with several GPUs each one gets its own worker process
+    # and PSX files; Metashape already uses every CPU core within a single worker
+    num_workers = min(len(Metashape.app.enumGPUDevices()) if USE_GPU else 1, len(unprocessed_transects))
+    
+    if num_workers <= 1:
+        batch_mapping.update(process_batches(unprocessed_transects))
+    else:
+        logging.info(f"Processing models on {num_workers} GPUs in parallel")
+        # Each worker is a fresh Metashape process rather than a fork or spawn of this one,
+        # so it initializes its own GPU and never starts a second copy of the parent
+        workers = [
+            subprocess.Popen(worker_command(
+                PROJECT_DIR, GPU_WORKER_FLAG, str(gpu_index),
+                # Round-robin partition so every worker gets a similar share
+                *unprocessed_transects[gpu_index::num_workers]))
+            for gpu_index in range(num_workers)
+        ]
+        for gpu_index, worker in enumerate(workers):
+            # Exit codes are not reliable under Metashape's -r mode, so the updates file is the only signal
+            worker.wait()
+            assigned = unprocessed_transects[gpu_index::num_workers]
+            updates_path = worker_updates_path(gpu_index)
+            recorded = apply_worker_updates(updates_path, batch_mapping) if os.path.exists(updates_path) else set()
+            missing = [t for t in assigned if t not in recorded]
+            if missing:
+                logging.error(f"GPU worker {gpu_index} stopped before processing {len(missing)} models: {', '.join(missing)}")
+    
     # Create batch summary
     create_or_update_batch_summary(batch_mapping)
     
     logging.info("Step 1 processing complete")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if GPU_WORKER_FLAG in sys.argv:
+        args = sys.argv[sys.argv.index(GPU_WORKER_FLAG) + 1:]
+        run_gpu_worker(int(args[0]), args[1:])
+        if not is_python_interpreter(sys.executable):
+            Metashape.app.quit() # -r mode otherwise leaves the application running
+    else:
+        main() 
\ No newline at end of file
@@ -15,52 +15,122 @@ import subprocess
 import tempfile
 import shutil
 import re
+import bisect
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from config import (
     VIDEO_SOURCE_DIRECTORY,
     DIRECTORIES,
     FRAMES_PER_TRANSECT,
+    FFMPEG_HWACCEL,
+    EXTRACTION_WORKERS,
+    FRAME_FORMAT,
     PROJECT_NAME,
     update_tracking,
+    flush_tracking,
     get_transect_status,
-    initialize_tracking
+    ensure_directory,
+    init_project
 )
 import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step0_{PROJECT_NAME}.log")),
-        logging.StreamHandler()
-    ]
+# Regex to capture base name and part number. Example: TCRMP..._FLC_T5_1 -> (TCRMP..._FLC_T5, 1)
+# Allows for optional _partX or _X pattern. Assumes transect ID ends with _T<number>
+MULTIPART_PATTERN = re.compile(r"^(.*_T\d+)(?:_part|_)?(\d+)$", re.IGNORECASE)
+# For single files that still conform to a transect naming like ..._T1 but without part numbers
+SINGLE_TRANSECT_PATTERN = re.compile(r"^(.*_T\d+)$", re.IGNORECASE)
+
+# FFmpeg log lines about hardware decoding: hwaccel/device messages and the hardware
+# decoder or API names FFmpeg prints (matched as words, not the configured setting)
+HWACCEL_LINE_PATTERN = re.compile(
+    r"hwaccel|hwdevice|hw_frames|hardware accelerat"
+    r"|\b(?:cuvid|nvdec|cuda|videotoolbox|vaapi|vdpau|qsv|d3d11va|dxva2|vulkan)\b"
+    r"|_(?:cuvid|videotoolbox|vaapi|qsv)\b",
+    re.IGNORECASE
 )
 
-def extract_frames_ffmpeg(video_path, output_dir, frames_per_transect, video_name):
+# FFmpeg encoder settings per processing.frame_format: (file extension, codec arguments)
+FRAME_ENCODERS = {
+    'tiff': ('.tiff', ['-c:v', 'tiff', '-pix_fmt', 'rgb24', '-compression_level', '0']),  # Uncompressed 8-bit RGB
+    'jpg': ('.jpg', ['-c:v', 'mjpeg', '-q:v', '2', '-pix_fmt', 'yuvj444p']),            # Near-lossless, full chroma
+}
+FRAME_EXTENSION, FRAME_CODEC_ARGS = FRAME_ENCODERS[FRAME_FORMAT]
+
+# Let FFmpeg choose its decode thread count for OpenCV captures
+os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", "threads;0")
+
+def open_video(video_path):
     """
-    Extract frames from a video file using FFmpeg with TIFF format (rgb24) and hardware acceleration.
+    Open a video with OpenCV's FFmpeg backend and a single-frame buffer.
+    
+    Pinning the backend and disabling readahead keeps CAP_PROP_POS_FRAMES
+    seeks deterministic across platforms.
     
     Args:
         video_path (str): Path to the video file
-        output_dir (str): Directory to save frames
-        frames_per_transect (int): Number of frames to extract. Must be > 0 if called.
-        video_name (str): Base name of the video file for frame naming within output_dir
     
     Returns:
-        tuple: (frames_extracted, extracted_frame_paths, video_length_seconds, total_video_frames)
+        cv2.VideoCapture: The opened (or failed-to-open) capture
+    """
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+def probe_video(video_path):
+    """
+    Read a video's frame count, frame rate and frame size.
+    
+    Args:
+        video_path (str): Path to the video file
+    
+    Returns:
+        tuple: (total_frames, fps, width, height)
     """
-    # Open video file with OpenCV just to get properties
     logging.info(f"Opening video: {video_path}")
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video(video_path)
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {video_path}")
+    try:
+        return (int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                cap.get(cv2.CAP_PROP_FPS),
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        cap.release()
+
+def ffmpeg_decode_args():
+    """
+    Input options placed before each FFmpeg `-i` so decoding is as fast as possible.
     
-    # Get video properties
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    cap.release()
+    Returns:
+        list: Hardware decoder selection plus automatic decoder threading
+    """
+    # Hardware acceleration; VideoToolbox can additionally be forced to decode on the GPU
+    args = ['-hwaccel', FFMPEG_HWACCEL]
+    if FFMPEG_HWACCEL == 'videotoolbox':
+        args += ['-hwaccel_output_format', 'videotoolbox_vld']
+    # Let the (software fallback) decoder use every core while the frame encoder runs alongside it
+    args += ['-threads', '0']
+    return args
+
+def extract_frames_ffmpeg(video_path, output_dir, frames_per_transect, video_name, video_props=None):
+    """
+    Extract frames from a video file using FFmpeg in the configured frame format and hardware acceleration.
+    
+    Args:
+        video_path (str): Path to the video file
+        output_dir (str): Directory to save frames
+        frames_per_transect (int): Number of frames to extract. Must be > 0 if called.
+        video_name (str): Base name of the video file for frame naming within output_dir
+        video_props (tuple): (total_frames, fps, width, height) from probe_video, if already known
+    
+    Returns:
+        tuple: (frames_extracted, extracted_frame_paths, video_length_seconds, total_video_frames)
+    """
+    # Open video file with OpenCV just to get properties, unless the caller already has them
+    if video_props is None:
+        video_props = probe_video(video_path)
+    total_frames, fps, width, height = video_props
     
     # Calculate video length in seconds
     video_length_seconds = total_frames / fps if fps > 0 else 0
@@ -68,7 +138,7 @@ def extract_frames_ffmpeg(video_path, output_dir, frames_per_transect, video_nam
     logging.info(f"Video properties: {width}x{height}, {fps} fps, {total_frames} frames, {video_length_seconds:.2f} seconds")
     
     # Create output directory
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_directory(output_dir)
     
     # Calculate fps value for the extraction
     if frames_per_transect <= 0:
@@ -89,31 +159,29 @@ def extract_frames_ffmpeg(video_path, output_dir, frames_per_transect, video_nam
     
     logging.info(f"Setting fps={extract_fps} to extract {frames_per_transect} frames from {video_length_seconds:.2f}s video for {video_name}")
     
-    # Extract frames using FFmpeg with TIFF format
-    logging.info(f"Extracting frames using TIFF format with rgb24")
-    print(f"Starting TIFF frame extraction from {os.path.basename(video_path)}")
+    # Extract frames using FFmpeg in the configured frame format
+    logging.info("Starting %s frame extraction from %s", FRAME_FORMAT, os.path.basename(video_path))
     
     # Define output pattern for the frames using video_name and 5-digit counter
-    output_pattern = os.path.join(output_dir, f"{video_name}_%05d.tiff")
+    output_pattern = os.path.join(output_dir, f"{video_name}_%05d{FRAME_EXTENSION}")
+    
+    hwaccel_args = ffmpeg_decode_args()
     
-    # FFmpeg command for TIFF extraction with hardware acceleration
+    # FFmpeg command for frame extraction with hardware acceleration
     ffmpeg_cmd = [
         'ffmpeg',
-        '-hwaccel', 'videotoolbox',     # Hardware acceleration
-        '-hwaccel_output_format', 'videotoolbox_vld',  # Force hardware decoding
+        *hwaccel_args,
         '-i', video_path,
         '-vf', f'fps={extract_fps}',    # Set frames per second for extraction
-        '-c:v', 'tiff',                 # Use TIFF codec 
-        '-pix_fmt', 'rgb24',            # Standard 8-bit RGB
-        '-compression_level', '0',      # No compression
+        *FRAME_CODEC_ARGS,              # Encoder for the configured frame format
         '-v', 'info',                   # Show information
         '-stats',                       # Show progress
         output_pattern
     ]
     
     try:
-        # Run FFmpeg with output visible to user
-        print("Running FFmpeg with hardware acceleration for TIFF extraction...")
+        # Run FFmpeg, relaying its output through logging
+        logging.info("Running FFmpeg with hardware acceleration for %s extraction...", FRAME_FORMAT)
         
         process = subprocess.Popen(
             ffmpeg_cmd,
@@ -123,32 +191,35 @@ def extract_frames_ffmpeg(video_path, output_dir, frames_per_transect, video_nam
             bufsize=1
         )
         
-        # Display FFmpeg output to monitor hardware acceleration
+        # FFmpeg's per-frame progress goes to DEBUG so it costs nothing at the default level;
+        # hardware acceleration messages stay visible. Only the last few lines are kept,
+        # for the error message, instead of the whole log
+        output_tail = deque(maxlen=20)
         for line in process.stdout:
             line = line.strip()
-            print(line)
+            output_tail.append(line)
             # Look for hardware acceleration confirmation messages
-            if 'hwaccel' in line.lower() or 'videotoolbox' in line.lower():
-                print(f"HARDWARE ACCELERATION INDICATOR: {line}")
+            if HWACCEL_LINE_PATTERN.search(line):
+                logging.info("HARDWARE ACCELERATION INDICATOR: %s", line)
+            else:
+                logging.debug("%s", line)
         
         process.wait()
         
         if process.returncode != 0:
-            raise subprocess.CalledProcessError(process.returncode, ffmpeg_cmd)
+            raise subprocess.CalledProcessError(process.returncode, ffmpeg_cmd, output="\n".join(output_tail))
         
         # Get list of extracted frames
         extracted_frame_paths = sorted([
             os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-            if f.endswith('.tiff')
+            if f.endswith(FRAME_EXTENSION)
         ])
         frames_extracted = len(extracted_frame_paths)
         
         # Check size of first frame
         if frames_extracted > 0:
             size_mb = os.path.getsize(extracted_frame_paths[0]) / (1024 * 1024)
-            print(f"First TIFF frame size: {size_mb:.2f} MB")
-        else:
-            print("No frames were extracted!")
+            logging.info("First %s frame size: %.2f MB", FRAME_FORMAT, size_mb)
     
     except subprocess.CalledProcessError as e:
         error_msg = "Unknown FFmpeg error"
@@ -158,18 +229,18 @@ def extract_frames_ffmpeg(video_path, output_dir, frames_per_transect, video_nam
             error_msg = e.stderr.decode()
             
         logging.error(f"FFmpeg error: {error_msg}")
-        print(f"ERROR: FFmpeg failed: {error_msg}")
         
         # Try simpler command without some options
-        print("Attempting simpler FFmpeg command...")
+        logging.info("Attempting simpler FFmpeg command...")
         
         # Simpler FFmpeg command without some options that might be causing problems
         ffmpeg_cmd = [
             'ffmpeg',
-            '-hwaccel', 'videotoolbox',
+            '-hwaccel', FFMPEG_HWACCEL,
             '-i', video_path,
             '-vf', f'fps={extract_fps}',
-            '-pix_fmt', 'rgb24',
+            *FRAME_CODEC_ARGS,  # Must match output_pattern's extension (mjpeg rejects rgb24)
+            '-y',               # Overwrite frames left by the failed attempt
             output_pattern
         ]
         
@@ -179,7 +250,7 @@ def extract_frames_ffmpeg(video_path, output_dir, frames_per_transect, video_nam
             # Get list of extracted frames
             extracted_frame_paths = sorted([
                 os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                if f.endswith('.tiff')
+                if f.endswith(FRAME_EXTENSION)
             ])
             frames_extracted = len(extracted_frame_paths)
             
@@ -189,13 +260,71 @@ def extract_frames_ffmpeg(video_path, output_dir, frames_per_transect, video_nam
     
     if frames_extracted == 0:
         logging.error("No frames were extracted!")
-        print("ERROR: Failed to extract any frames")
     else:
-        logging.info(f"Successfully extracted {frames_extracted} TIFF frames")
-        print(f"SUCCESS: Extracted {frames_extracted} TIFF frames to {output_dir}")
+        logging.info("Successfully extracted %d %s frames to %s", frames_extracted, FRAME_FORMAT, output_dir)
     
     return frames_extracted, extracted_frame_paths, video_length_seconds, total_frames
 
+def extract_frames_ffmpeg_concat(video_paths, output_dir, frames_per_transect, total_duration, transect_id):
+    """
+    Extract frames from all parts of a transect in a single FFmpeg run.
+    
+    The parts are joined with FFmpeg's concat demuxer and sampled at one global
+    rate, so there is one decoder and muxer setup per transect and frames are
+    written straight into output_dir with transect-wide numbering.
+    
+    Args:
+        video_paths (list[str]): Video parts in playback order
+        output_dir (str): Directory to save frames
+        frames_per_transect (int): Number of frames to extract across all parts
+        total_duration (float): Combined duration of the parts in seconds
+        transect_id (str): Transect ID used for frame naming
+    
+    Returns:
+        list or None: Sorted paths of the extracted frames, or None if FFmpeg failed
+    """
+    extract_fps = frames_per_transect / total_duration
+    output_pattern = os.path.join(output_dir, f"{transect_id}_%05d{FRAME_EXTENSION}")
+    
+    hwaccel_args = ffmpeg_decode_args()
+    
+    with tempfile.TemporaryDirectory(prefix=f"{transect_id}_concat_") as list_dir:
+        list_path = os.path.join(list_dir, "parts.txt")
+        with open(list_path, 'w') as f:
+            for path in video_paths:
+                # Concat list syntax: single-quoted paths with embedded quotes escaped
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        
+        ffmpeg_cmd = [
+            'ffmpeg',
+            '-nostdin', '-y',
+            *hwaccel_args,
+            '-f', 'concat', '-safe', '0',
+            '-i', list_path,
+            '-vf', f'fps={extract_fps}',    # One sampling rate across all parts
+            *FRAME_CODEC_ARGS,
+            '-v', 'error',
+            output_pattern
+        ]
+        
+        logging.info(f"Extracting {frames_per_transect} frames from {len(video_paths)} parts of {transect_id} in one FFmpeg run (fps={extract_fps})")
+        result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    
+    prefix = f"{transect_id}_"
+    with os.scandir(output_dir) as it:
+        frame_paths = sorted(entry.path for entry in it
+                             if entry.name.startswith(prefix) and entry.name.endswith(FRAME_EXTENSION))
+    
+    if result.returncode != 0:
+        logging.warning(f"Single-run extraction failed for {transect_id}, falling back to per-part extraction: {result.stderr.strip()}")
+        # Clear partial output so the per-part run starts from frame 1 cleanly
+        for path in frame_paths:
+            os.remove(path)
+        return None
+    
+    return frame_paths
+
 def extract_frames_ffmpeg_alternative(video_path, output_dir, frames_per_transect, video_name):
     """
     Alternative high-quality extraction method for cinema footage using EXR format.
@@ -210,7 +339,7 @@ def extract_frames_ffmpeg_alternative(video_path, output_dir, frames_per_transec
         tuple: (frames_extracted, extracted_frame_paths, video_length_seconds, total_video_frames)
     """
     # Open video file with OpenCV just to get properties
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video(video_path)
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {video_path}")
     
@@ -254,7 +383,7 @@ def extract_frames_ffmpeg_alternative(video_path, output_dir, frames_per_transec
             test_output = os.path.join(output_dir, f"test_frame{ext}")
             test_cmd = [
                 'ffmpeg',
-                '-hwaccel', 'videotoolbox',
+                '-hwaccel', FFMPEG_HWACCEL,
                 '-ss', '0',
                 '-i', video_path,
                 '-vframes', '1'
@@ -294,7 +423,7 @@ def extract_frames_ffmpeg_alternative(video_path, output_dir, frames_per_transec
         # Extract this specific frame
         frame_cmd = [
             'ffmpeg',
-            '-hwaccel', 'videotoolbox',
+            '-hwaccel', FFMPEG_HWACCEL,
             '-ss', str(timestamp),
             '-i', video_path,
             '-vframes', '1'
@@ -336,7 +465,7 @@ def extract_frames_ffmpeg_png(video_path, output_dir, frames_per_transect, video
     """
     # Open video file with OpenCV just to get properties
     logging.info(f"Opening video: {video_path}")
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video(video_path)
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {video_path}")
     
@@ -353,7 +482,7 @@ def extract_frames_ffmpeg_png(video_path, output_dir, frames_per_transect, video
     logging.info(f"Video properties: {width}x{height}, {fps} fps, {total_frames} frames, {video_length_seconds:.2f} seconds")
     
     # Create output directory
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_directory(output_dir)
     
     # Calculate which frames to extract
     if frames_per_transect <= 0:
@@ -387,7 +516,7 @@ def extract_frames_ffmpeg_png(video_path, output_dir, frames_per_transect, video
         # Extract just this one frame as PNG (lossless)
         frame_cmd = [
             'ffmpeg',
-            '-hwaccel', 'videotoolbox',
+            '-hwaccel', FFMPEG_HWACCEL,
             '-ss', str(timestamp),   # Seek to timestamp
             '-i', video_path,
             '-vframes', '1',         # Extract just one frame
@@ -438,13 +567,15 @@ def extract_frames_png(video_path, output_dir, frames_per_transect, video_name):
         tuple: (frames_extracted, extracted_frame_paths, video_length_seconds, total_video_frames)
     """
     # Open video file
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video(video_path)
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {video_path}")
     
     # Get video properties
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     
     # Calculate video length in seconds
     video_length_seconds = total_frames / fps if fps > 0 else 0
@@ -460,16 +591,22 @@ def extract_frames_png(video_path, output_dir, frames_per_transect, video_name):
         frame_indices = np.linspace(0, total_frames - 1, frames_per_transect, dtype=int)
     
     # Create output directory
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_directory(output_dir)
     
     # Extract frames as PNG (lossless)
     frames_extracted = 0
     extracted_frame_paths = []
     
+    # Decode every frame into the same preallocated buffer
+    frame_buf = np.empty((height, width, 3), np.uint8)
+    
     for i, frame_idx in enumerate(frame_indices):
         cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
+        if not cap.grab():
+            continue
+        ret, frame_buf = cap.retrieve(frame_buf)
         if ret:
+            frame = frame_buf
             # Save as PNG for lossless quality using video_name and 1-based counter
             frame_counter = i + 1
             output_path = os.path.join(output_dir, f"{video_name}_{frame_counter:05d}.png")
@@ -480,6 +617,21 @@ def extract_frames_png(video_path, output_dir, frames_per_transect, video_name):
     cap.release()
     return frames_extracted, extracted_frame_paths, video_length_seconds, total_frames
 
+def write_jpeg(output_path, frame, quality=100):
+    """
+    Write a BGR frame as JPEG.
+    
+    Args:
+        output_path (str): Path of the JPEG file to write
+        frame (numpy.ndarray): BGR image
+        quality (int): JPEG quality (0-100)
+    
+    Returns:
+        str: The path that was written
+    """
+    cv2.imwrite(output_path, frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return output_path
+
 def extract_frames(video_path, output_dir, frames_per_transect, video_name):
     """
     Extract frames from a video file using OpenCV (legacy method).
@@ -494,13 +646,15 @@ def extract_frames(video_path, output_dir, frames_per_transect, video_name):
         tuple: (frames_extracted, extracted_frame_paths, video_length_seconds, total_video_frames)
     """
     # Open video file
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video(video_path)
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {video_path}")
     
     # Get video properties
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     
     # Calculate video length in seconds
     video_length_seconds = total_frames / fps if fps > 0 else 0
@@ -515,23 +669,36 @@ def extract_frames(video_path, output_dir, frames_per_transect, video_name):
         frame_indices = np.linspace(0, total_frames - 1, frames_per_transect, dtype=int)
     
     # Create output directory
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Extract frames
-    frames_extracted = 0
-    extracted_frame_paths = []
-    
-    for i, frame_idx in enumerate(frame_indices):
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-        if ret:
-            frame_counter = i + 1 # Use 1-based counter
-            output_path = os.path.join(output_dir, f"{video_name}_{frame_counter:05d}.jpg")
-            cv2.imwrite(output_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 100])
-            frames_extracted += 1
-            extracted_frame_paths.append(output_path)
+    ensure_directory(output_dir)
+    
+    # Extract frames, encoding JPEGs on worker threads so decode overlaps encode + IO
+    write_futures = []
+    
+    # Decode into a fixed ring of preallocated buffers; a buffer is reused only
+    # once the write that last used it has finished
+    max_workers = 4
+    frame_bufs = [np.empty((height, width, 3), np.uint8) for _ in range(2 * max_workers)]
+    buf_futures = [None] * len(frame_bufs)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, frame_idx in enumerate(frame_indices):
+            slot = i % len(frame_bufs)
+            if buf_futures[slot] is not None:
+                buf_futures[slot].result()
+            
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            if not cap.grab():
+                continue
+            ret, frame_bufs[slot] = cap.retrieve(frame_bufs[slot])
+            if ret:
+                frame_counter = i + 1 # Use 1-based counter
+                output_path = os.path.join(output_dir, f"{video_name}_{frame_counter:05d}.jpg")
+                buf_futures[slot] = executor.submit(write_jpeg, output_path, frame_bufs[slot])
+                write_futures.append(buf_futures[slot])
     
     cap.release()
+    extracted_frame_paths = [future.result() for future in write_futures]
+    frames_extracted = len(extracted_frame_paths)
     return frames_extracted, extracted_frame_paths, video_length_seconds, total_frames
 
 def process_transect(transect_id, video_paths_for_transect):
@@ -547,8 +714,7 @@ def process_transect(transect_id, video_paths_for_transect):
     """
     output_dir_final = os.path.join(DIRECTORIES["frames"], transect_id)
     
-    initialize_tracking(transect_id) 
-    
+    # The tracking row is created lazily by the first flushed update_tracking call
     status = get_transect_status(transect_id)
     if status.get("Step 0 complete", "False") == "True":
         logging.info(f"Transect {transect_id} already processed, skipping...")
@@ -562,18 +728,22 @@ def process_transect(transect_id, video_paths_for_transect):
         total_video_length_seconds_all_parts = 0
         grand_total_video_frames_all_parts = 0
 
-        for video_path_part in video_paths_for_transect:
+        # Probe every part at once; opening a capture is mostly container I/O, during which
+        # OpenCV releases the GIL, so the per-part latencies overlap
+        with ThreadPoolExecutor(max_workers=min(8, len(video_paths_for_transect))) as executor:
+            probe_futures = [executor.submit(probe_video, path) for path in video_paths_for_transect]
+
+        for video_path_part, probe_future in zip(video_paths_for_transect, probe_futures):
             logging.info(f"Getting properties for part: {video_path_part}")
-            cap = cv2.VideoCapture(video_path_part)
-            if not cap.isOpened():
+            try:
+                part_props = probe_future.result()
+            except ValueError:
                 # Log specific part failure and continue if possible, or raise
                 logging.error(f"Could not open video file part: {video_path_part} for transect {transect_id}")
                 # Option: skip this part or raise error for whole transect
                 raise ValueError(f"Could not open video file part: {video_path_part} for transect {transect_id}")
 
-            part_total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            part_fps = cap.get(cv2.CAP_PROP_FPS)
-            cap.release()
+            part_total_frames, part_fps = part_props[:2]
             
             part_duration_seconds = 0
             if part_fps > 0 and part_total_frames > 0 : # Ensure both are positive
@@ -591,7 +761,8 @@ def process_transect(transect_id, video_paths_for_transect):
                 "path": video_path_part, 
                 "duration": part_duration_seconds, 
                 "total_frames": part_total_frames,
-                "basename": part_basename
+                "basename": part_basename,
+                "props": part_props
             })
 
         if FRAMES_PER_TRANSECT <= 0:
@@ -610,7 +781,7 @@ def process_transect(transect_id, video_paths_for_transect):
                 "Frames directory": output_dir_final,
                 "Notes": f"FRAMES_PER_TRANSECT set to {FRAMES_PER_TRANSECT}. No frames extracted."
             })
-            os.makedirs(output_dir_final, exist_ok=True) # Create directory even if no frames
+            ensure_directory(output_dir_final) # Create directory even if no frames
             return transect_id, True
 
         if total_video_length_seconds_all_parts <= 0:
@@ -618,12 +789,27 @@ def process_transect(transect_id, video_paths_for_transect):
              logging.error(error_msg)
              raise ValueError(error_msg)
 
-        os.makedirs(output_dir_final, exist_ok=True)
+        ensure_directory(output_dir_final)
         global_frame_output_counter = 1
         cumulative_frames_extracted_count = 0
         all_final_frame_paths = [] # To store paths of successfully moved frames for logging/verification
 
-        for idx, part_info in enumerate(part_details):
+        # Multi-part transects are decoded in one FFmpeg run; per-part extraction is the fallback
+        parts_to_extract = part_details
+        if len(part_details) > 1:
+            concat_frame_paths = extract_frames_ffmpeg_concat(
+                [part_info["path"] for part_info in part_details],
+                output_dir_final,
+                FRAMES_PER_TRANSECT,
+                total_video_length_seconds_all_parts,
+                transect_id
+            )
+            if concat_frame_paths is not None:
+                all_final_frame_paths = concat_frame_paths
+                cumulative_frames_extracted_count = len(concat_frame_paths)
+                parts_to_extract = []
+
+        for idx, part_info in enumerate(parts_to_extract):
             part_path = part_info["path"]
             part_duration = part_info["duration"]
             part_basename = part_info["basename"]
@@ -653,7 +839,8 @@ def process_transect(transect_id, video_paths_for_transect):
                     part_path,
                     temp_part_output_dir,
                     frames_to_extract_for_this_part,
-                    part_basename 
+                    part_basename,
+                    video_props=part_info["props"]
                 )
 
                 if num_actually_extracted > 0:
@@ -693,7 +880,8 @@ def process_transect(transect_id, video_paths_for_transect):
             "Notes": f"Extracted {cumulative_frames_extracted_count} frames from {grand_total_video_frames_all_parts} total frames across {len(video_paths_for_transect)} part(s) ({total_video_length_seconds_all_parts:.2f}s total video duration)."
         })
         
-        logging.info(f"Successfully extracted {cumulative_frames_extracted_count} frames for transect {transect_id} (total duration: {total_video_length_seconds_all_parts:.2f}s) in {processing_time:.1f} seconds. Frames saved to {output_dir_final}")
+        logging.info("Successfully extracted %d frames for transect %s (total duration: %.2fs) in %.1f seconds. Frames saved to %s",
+                     cumulative_frames_extracted_count, transect_id, total_video_length_seconds_all_parts, processing_time, output_dir_final)
         return transect_id, True
         
     except Exception as e:
@@ -705,9 +893,9 @@ def process_transect(transect_id, video_paths_for_transect):
         update_tracking(current_transect_id_for_error, {
             "Status": "Error in frame extraction",
             "Step 0 complete": "False",
-            "Step 0 error time": error_time,
-            "Notes": f"Error: {str(e)}"
+            "Notes": f"Error at {error_time}: {str(e)}"
         })
+        flush_tracking()
         return current_transect_id_for_error, False
 
 def main():
@@ -717,9 +905,12 @@ def main():
     # os.makedirs(DIRECTORIES["reports"], exist_ok=True) # Removed this line causing KeyError
     
     # Get list of video files
-    video_files_paths = []
-    for ext in ['.mov', '.mp4', '.mkv', '.MOV', '.MP4', '.MKV']:
-        video_files_paths.extend(Path(VIDEO_SOURCE_DIRECTORY).glob(f"*{ext}"))
+    try:
+        with os.scandir(VIDEO_SOURCE_DIRECTORY) as entries:
+            video_files_paths = [Path(entry.path) for entry in entries
+                                 if entry.name.lower().endswith(('.mov', '.mp4', '.mkv')) and entry.is_file()]
+    except FileNotFoundError:
+        video_files_paths = []
     
     if not video_files_paths:
         logging.error(f"No video files found in {VIDEO_SOURCE_DIRECTORY}")
@@ -728,12 +919,7 @@ def main():
     logging.info(f"Found {len(video_files_paths)} video file(s) to potentially process.")
 
     # Group videos by transect ID
-    grouped_videos = {}
-    # Regex to capture base name and part number. Example: TCRMP..._FLC_T5_1 -> (TCRMP..._FLC_T5, 1)
-    # Allows for optional _partX or _X pattern. Assumes transect ID ends with _T<number>
-    multipart_pattern = re.compile(r"^(.*_T\d+)(?:_part|_)?(\d+)$", re.IGNORECASE) 
-    # For single files that still conform to a transect naming like ..._T1 but without part numbers
-    single_transect_pattern = re.compile(r"^(.*_T\d+)$", re.IGNORECASE)
+    grouped_videos = defaultdict(list)
 
     for video_path_obj in video_files_paths:
         video_stem = video_path_obj.stem # Filename without extension
@@ -741,12 +927,12 @@ def main():
         base_name_for_group = None
         part_number = 0 # Default for single videos or if base part is not numbered "_1"
 
-        match_multipart = multipart_pattern.match(video_stem)
+        match_multipart = MULTIPART_PATTERN.match(video_stem)
         if match_multipart:
             base_name_for_group = match_multipart.group(1)
             part_number = int(match_multipart.group(2))
         else:
-            match_single_transect = single_transect_pattern.match(video_stem)
+            match_single_transect = SINGLE_TRANSECT_PATTERN.match(video_stem)
             if match_single_transect:
                 base_name_for_group = match_single_transect.group(1)
                 # part_number remains 0, indicating it's the base or only part
@@ -756,28 +942,32 @@ def main():
                 base_name_for_group = video_stem
                 # part_number remains 0
 
-        if base_name_for_group not in grouped_videos:
-            grouped_videos[base_name_for_group] = []
-        
-        # Store path as string, and part number for sorting
-        grouped_videos[base_name_for_group].append({'path': str(video_path_obj), 'part': part_number})
+        # Keep parts sorted by part number as they are inserted.
+        # Part 0 (single/base) comes before numbered parts.
+        bisect.insort(grouped_videos[base_name_for_group], (part_number, str(video_path_obj)))
 
     logging.info(f"Grouped into {len(grouped_videos)} transect(s) to process.")
     
-    results = []
-    transect_count = 0
-    for transect_id, parts_data in grouped_videos.items():
-        transect_count += 1
-        # Sort parts by part number. Part 0 (single/base) comes before numbered parts.
-        parts_data.sort(key=lambda x: x['part'])
-        
-        sorted_video_paths_for_transect = [p['path'] for p in parts_data]
-        
-        logging.info(f"Processing transect {transect_count}/{len(grouped_videos)}: {transect_id} with {len(sorted_video_paths_for_transect)} part(s): {', '.join(os.path.basename(p) for p in sorted_video_paths_for_transect)}")
+    def run_transect(transect_count, transect_id, sorted_video_paths_for_transect):
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info("Processing transect %d/%d: %s with %d part(s): %s",
+                         transect_count, len(grouped_videos), transect_id, len(sorted_video_paths_for_transect),
+                         ", ".join(map(os.path.basename, sorted_video_paths_for_transect)))
         
         # Call the refactored processing function
-        processed_transect_id, success = process_transect(transect_id, sorted_video_paths_for_transect)
-        results.append((processed_transect_id, success))
+        return process_transect(transect_id, sorted_video_paths_for_transect)
+    
+    # Each transect's extraction is mostly an FFmpeg subprocess, so threads are enough to
+    # keep EXTRACTION_WORKERS of them running at once; tracking updates are thread-safe
+    with ThreadPoolExecutor(max_workers=max(1, min(EXTRACTION_WORKERS, len(grouped_videos)))) as executor:
+        futures = [
+            executor.submit(run_transect, transect_count, transect_id, [path for _, path in parts_data])
+            for transect_count, (transect_id, parts_data) in enumerate(grouped_videos.items(), 1)
+        ]
+        results = [future.result() for future in futures]
+    
+    # Write any tracking updates still queued from the run
+    flush_tracking()
     
     # Create summary of results - REMOVED
     # create_frame_summary()
@@ -792,4 +982,17 @@ def main():
             logging.warning(f"Failed to process the following transect(s): {', '.join(failed_transects)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Create project directories before logging writes into them
+    init_project()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step0_{PROJECT_NAME}.log")),
+            logging.StreamHandler()
+        ]
+    )
+    
+    main()
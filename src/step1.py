@@ -7,13 +7,14 @@ Documents are properly closed between batches to prevent interference.
 
 import os
 import logging
-import Metashape
 import datetime
 import math
-import pandas as pd
 import time
 import sys
 import traceback
+import gc
+import functools
+import types
 from config import (
     DIRECTORIES,
     PROJECT_NAME,
@@ -21,48 +22,45 @@ from config import (
     USE_GPU,
     PARAMS,
     update_tracking,
-    get_transect_status,
-    TIMESTAMP
+    flush_tracking,
+    get_all_transect_status,
+    TIMESTAMP,
+    init_project
 )
 
-# Print all directory paths for debugging
-print("DEBUG: Directory paths:")
-for key, path in DIRECTORIES.items():
-    print(f"  {key}: {path}")
-    # Check if directory exists
-    if os.path.exists(path):
-        print(f"    [EXISTS]")
-    else:
-        print(f"    [DOES NOT EXIST]")
-        try:
-            os.makedirs(path, exist_ok=True)
-            print(f"    [CREATED]")
-        except Exception as e:
-            print(f"    [FAILED TO CREATE: {str(e)}]")
+# Maximum number of chunks per PSX file
+MAX_CHUNKS_PER_PSX = PARAMS['processing'].get('max_chunks_per_psx', 5)
 
-# Try to create each directory explicitly
-print("DEBUG: Attempting to create all directories:")
-for key, path in DIRECTORIES.items():
-    try:
-        print(f"Creating directory: {path}")
-        os.makedirs(path, exist_ok=True)
-        print(f"  Success!")
-    except Exception as e:
-        print(f"  Error creating {path}: {str(e)}")
-        traceback.print_exc()
+# Number of transects processed between intermediate saves of a batch PSX
+CHECKPOINT_EVERY = max(1, PARAMS['processing'].get('checkpoint_every', 2))
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step1_isolated_{PROJECT_NAME}_{TIMESTAMP}.log")),
-        logging.StreamHandler()
-    ]
-)
+def _ensure_dirs():
+    """Report and create all configured directories before processing."""
+    # Print all directory paths for debugging
+    print("DEBUG: Directory paths:")
+    for key, path in DIRECTORIES.items():
+        print(f"  {key}: {path}")
+        # Check if directory exists
+        if os.path.exists(path):
+            print(f"    [EXISTS]")
+        else:
+            print(f"    [DOES NOT EXIST]")
+            try:
+                os.makedirs(path, exist_ok=True)
+                print(f"    [CREATED]")
+            except Exception as e:
+                print(f"    [FAILED TO CREATE: {str(e)}]")
 
-# Maximum number of chunks per PSX file
-MAX_CHUNKS_PER_PSX = PARAMS['processing'].get('max_chunks_per_psx', 5)
+    # Try to create each directory explicitly
+    print("DEBUG: Attempting to create all directories:")
+    for key, path in DIRECTORIES.items():
+        try:
+            print(f"Creating directory: {path}")
+            os.makedirs(path, exist_ok=True)
+            print(f"  Success!")
+        except Exception as e:
+            print(f"  Error creating {path}: {str(e)}")
+            traceback.print_exc()
 
 def enumerate_gpus():
     """
@@ -71,6 +69,8 @@ def enumerate_gpus():
     Returns:
         list: List of available GPU devices
     """
+    import Metashape
+    
     logging.info("Enumerating available GPU devices...")
     gpu_devices = Metashape.app.enumGPUDevices()
     
@@ -99,6 +99,8 @@ def setup_gpu(gpu_devices=None):
     Returns:
         bool: Whether GPU processing was successfully enabled
     """
+    import Metashape
+    
     if not USE_GPU:
         logging.info("GPU processing disabled in config")
         return False
@@ -127,6 +129,26 @@ def setup_gpu(gpu_devices=None):
     
     return True
 
+@functools.lru_cache(maxsize=1)
+def metashape_options():
+    """
+    Resolve the Metashape enum settings named in METASHAPE_DEFAULTS, once per process.
+    
+    Returns:
+        types.SimpleNamespace: Enum values keyed by setting name
+    """
+    import Metashape
+    
+    return types.SimpleNamespace(
+        depth_filter_mode=getattr(Metashape, METASHAPE_DEFAULTS["depth_filter_mode"]),
+        surface_type=getattr(Metashape, METASHAPE_DEFAULTS["surface_type"]),
+        face_count=getattr(Metashape, METASHAPE_DEFAULTS["face_count"]),
+        interpolation=getattr(Metashape, METASHAPE_DEFAULTS["interpolation"]),
+        mapping_mode=getattr(Metashape, METASHAPE_DEFAULTS["mapping_mode"]),
+        texture_type=getattr(Metashape.Model, METASHAPE_DEFAULTS["texture_type"]),
+        blending_mode=getattr(Metashape, METASHAPE_DEFAULTS["blending_mode"]),
+    )
+
 def process_transect(transect_id, chunk, doc, psx_path):
     """
     Process a single transect through initial 3D reconstruction.
@@ -138,10 +160,14 @@ def process_transect(transect_id, chunk, doc, psx_path):
         psx_path (str): The path to save the PSX file
         
     Returns:
-        bool: Success or failure
+        dict: Tracking update recording the completed transect, or None on failure;
+            the caller records it once the chunk has been saved
     """
+    import Metashape
+    
     try:
         start_time = datetime.datetime.now()
+        options = metashape_options()
         
         # Set up GPU processing
         gpu_devices = enumerate_gpus()
@@ -215,19 +241,29 @@ def process_transect(transect_id, chunk, doc, psx_path):
             S = Metashape.Matrix().Diag([s, s, s, 1])                  # scale matrix
         else:
             S = Metashape.Matrix().Diag([1, 1, 1, 1])
-            
-        T = Metashape.Matrix([[R[0, 0], R[0, 1], R[0, 2], C[0]],
-                             [R[1, 0], R[1, 1], R[1, 2], C[1]],
-                             [R[2, 0], R[2, 1], R[2, 2], C[2]],
-                             [     0,      0,      0,    1]])
-                             
-        chunk.transform.matrix = S * T.inv()  # resulting chunk transformation matrix
+        
+        # An axis-aligned region at the origin leaves the transform as S; skip the
+        # inverse and the transform reassignment if the chunk already has it
+        rot_is_identity = all(abs(R[i, j] - (1.0 if i == j else 0.0)) < 1e-9 for i in range(3) for j in range(3))
+        center_zero = all(abs(C[i]) < 1e-9 for i in range(3))
+        transform_is_scale = not chunk.transform.matrix or all(
+            abs(chunk.transform.matrix[i, j] - S[i, j]) < 1e-9 for i in range(4) for j in range(4))
+        
+        if rot_is_identity and center_zero and transform_is_scale:
+            logging.info("Coordinate system already aligned to bounding box, skipping rotation")
+        else:
+            T = Metashape.Matrix([[R[0, 0], R[0, 1], R[0, 2], C[0]],
+                                 [R[1, 0], R[1, 1], R[1, 2], C[1]],
+                                 [R[2, 0], R[2, 1], R[2, 2], C[2]],
+                                 [     0,      0,      0,    1]])
+                                 
+            chunk.transform.matrix = S * T.inv()  # resulting chunk transformation matrix
         
         # Build depth maps
         logging.info(f"Building depth maps for model {transect_id}")
         chunk.buildDepthMaps(
             downscale=METASHAPE_DEFAULTS["depth_downscale"],
-            filter_mode=getattr(Metashape, METASHAPE_DEFAULTS["depth_filter_mode"]),
+            filter_mode=options.depth_filter_mode,
             reuse_depth=False,
             max_neighbors=METASHAPE_DEFAULTS.get("max_neighbors", 16),
             subdivide_task=True  # Split into subtasks for better GPU utilization
@@ -237,9 +273,9 @@ def process_transect(transect_id, chunk, doc, psx_path):
         logging.info(f"Building model for {transect_id}")
         chunk.buildModel(
             source_data=Metashape.DepthMapsData,
-            surface_type=getattr(Metashape, METASHAPE_DEFAULTS["surface_type"]),
-            face_count=getattr(Metashape, METASHAPE_DEFAULTS["face_count"]),
-            interpolation=getattr(Metashape, METASHAPE_DEFAULTS["interpolation"]),
+            surface_type=options.surface_type,
+            face_count=options.face_count,
+            interpolation=options.interpolation,
             vertex_colors=METASHAPE_DEFAULTS["vertex_colors"],
             subdivide_task=True  # Split into subtasks for better GPU utilization
         )
@@ -264,7 +300,7 @@ def process_transect(transect_id, chunk, doc, psx_path):
         # Build UV
         logging.info(f"Building UV for model {transect_id}")
         chunk.buildUV(
-            mapping_mode=getattr(Metashape, METASHAPE_DEFAULTS["mapping_mode"]),
+            mapping_mode=options.mapping_mode,
             texture_size=METASHAPE_DEFAULTS["texture_size"],
             page_count=METASHAPE_DEFAULTS.get("page_count", 1)
         )
@@ -273,8 +309,8 @@ def process_transect(transect_id, chunk, doc, psx_path):
         logging.info(f"Building texture for model {transect_id}")
         chunk.buildTexture(
             texture_size=METASHAPE_DEFAULTS["texture_size"],
-            texture_type=getattr(Metashape.Model, METASHAPE_DEFAULTS["texture_type"]),
-            blending_mode=getattr(Metashape, METASHAPE_DEFAULTS["blending_mode"]),
+            texture_type=options.texture_type,
+            blending_mode=options.blending_mode,
             enable_gpu=True,  # Force GPU usage for texture generation
             ghosting_filter=METASHAPE_DEFAULTS.get("ghosting_filter", True),
             fill_holes=METASHAPE_DEFAULTS.get("fill_holes", True)
@@ -292,8 +328,9 @@ def process_transect(transect_id, chunk, doc, psx_path):
         end_time = datetime.datetime.now()
         processing_time = (end_time - start_time).total_seconds()
         
-        # Update tracking file
-        update_tracking(transect_id, {
+        logging.info(f"Successfully processed model {transect_id} in {processing_time:.1f} seconds")
+        Metashape.app.update() # Added update after model build
+        return {
             "Status": "Step 1 complete",
             "Step 1 complete": "True",
             "Step 1 start time": start_time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -301,11 +338,7 @@ def process_transect(transect_id, chunk, doc, psx_path):
             "Step 1 processing time (s)": str(processing_time),
             "Aligned cameras": str(len([c for c in chunk.cameras if c.transform])),
             "Total cameras": str(len(chunk.cameras))
-        })
-        
-        logging.info(f"Successfully processed model {transect_id} in {processing_time:.1f} seconds")
-        Metashape.app.update() # Added update after model build
-        return True
+        }
         
     except Exception as e:
         error_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -317,9 +350,29 @@ def process_transect(transect_id, chunk, doc, psx_path):
             "Step 1 error time": error_time,
             "Notes": error_msg
         })
-        return False
+        flush_tracking()
+        return None
 
-def process_batch(transects, batch_num, timestamp):
+def save_batch(doc, psx_path, completed):
+    """
+    Save a batch document, then record the transects whose chunks it now holds.
+    
+    Args:
+        doc (Metashape.Document): The batch document
+        psx_path (str): The path to save the PSX file
+        completed (list): (transect_id, tracking update) pairs not yet recorded; emptied by the save
+    """
+    import Metashape
+    
+    Metashape.app.update() # Keep update BEFORE saving
+    doc.save(psx_path)
+    
+    # A transect only counts as complete once its chunk is on disk
+    for transect_id, data in completed:
+        update_tracking(transect_id, data)
+    completed.clear()
+
+def process_batch(transects, batch_num, timestamp, all_status):
     """
     Process a single batch of transects and completely close it before returning.
     
@@ -327,10 +380,13 @@ def process_batch(transects, batch_num, timestamp):
         transects (list): List of transect IDs to process
         batch_num (int): Batch number
         timestamp (str): Timestamp string
+        all_status (dict): Tracking status for every model, keyed by model ID
         
     Returns:
         dict: Mapping of processed transects to their PSX file
     """
+    import Metashape
+    
     if not transects:
         return {}
     
@@ -352,10 +408,16 @@ def process_batch(transects, batch_num, timestamp):
     # Results tracking
     results = {}
     
+    # Completion updates for transects whose chunks have not been saved yet
+    completed = []
+    
+    # Chunks not yet written by a save, whose depth maps must be kept until then
+    unsaved_chunks = []
+    
     # Process each transect in the batch
     for i, transect_id in enumerate(transects):
         # Skip if already processed
-        status = get_transect_status(transect_id)
+        status = all_status.get(transect_id, {})
         if status.get("Step 1 complete", "False") == "True":
             logging.info(f"Model {transect_id} already processed, skipping...")
             continue
@@ -366,12 +428,20 @@ def process_batch(transects, batch_num, timestamp):
         chunk = doc.addChunk()
         
         # Process the transect
-        success = process_transect(transect_id, chunk, doc, psx_path)
-        
+        try:
+            completion = process_transect(transect_id, chunk, doc, psx_path)
+        except Exception:
+            # Save completed chunks before propagating an unexpected failure
+            logging.error(f"Unexpected failure on {transect_id}, saving document to {psx_path}")
+            save_batch(doc, psx_path, completed)
+            flush_tracking()
+            raise
+        
+        success = completion is not None
         if success:
             results[transect_id] = psx_path
-            # Update tracking with the PSX path
-            update_tracking(transect_id, {"PSX file": psx_path})
+            # Record the PSX path with the completion
+            completion["PSX file"] = psx_path
             
             # Create report for this transect
             try:
@@ -383,22 +453,36 @@ def process_batch(transects, batch_num, timestamp):
                 report_file_path = os.path.join(reports_initial_dir, f"{transect_id}_step1.pdf")
                 chunk.exportReport(report_file_path, title=f"Model {transect_id} - Step 1 Report")
                 
-                # Update tracking with report path
-                update_tracking(transect_id, {"Report file": report_file_path})
+                # Record the report path with the completion
+                completion["Report file"] = report_file_path
                 
                 logging.info(f"Report generated: {report_file_path}")
             except Exception as e:
                 logging.error(f"Error generating report for {transect_id}: {str(e)}")
             
-        # Save the document after each transect
-        logging.info(f"Saving document to {psx_path} after processing {transect_id}")
-        Metashape.app.update() # Keep update BEFORE saving in process_batch
-        doc.save(psx_path)
+            completed.append((transect_id, completion))
+        unsaved_chunks.append(chunk)
+            
+        # Checkpoint the document every CHECKPOINT_EVERY transects or after a failure;
+        # the last transect is covered by the final save below
+        is_last = i == len(transects) - 1
+        if not is_last and (not success or (i + 1) % CHECKPOINT_EVERY == 0):
+            logging.info(f"Saving checkpoint to {psx_path} after processing {transect_id}")
+            save_batch(doc, psx_path, completed)
+            
+            # Depth maps are not used after the model is built (Steps 2-4 work from the
+            # textured model), so release them once the saved PSX holds these chunks
+            for saved_chunk in unsaved_chunks:
+                if saved_chunk.depth_maps:
+                    saved_chunk.depth_maps = None
+            unsaved_chunks.clear()
     
     # Final save of the document
     logging.info(f"Final save of batch {batch_num} to {psx_path}")
-    Metashape.app.update() # Keep update BEFORE final save in process_batch
-    doc.save(psx_path)
+    save_batch(doc, psx_path, completed)
+    
+    # Write the batch's tracking updates alongside the saved document
+    flush_tracking()
     
     # Important: Clear the document reference to fully release it
     doc = None
@@ -407,21 +491,26 @@ def process_batch(transects, batch_num, timestamp):
 
 def main():
     """Process transects in completely isolated batches."""
+    _ensure_dirs()
+    
     # Get list of transect directories with frames
     transect_dirs = []
     frames_dir = DIRECTORIES["frames"]
     if os.path.exists(frames_dir):
-        transect_dirs = [d for d in os.listdir(frames_dir) 
-                        if os.path.isdir(os.path.join(frames_dir, d))]
+        with os.scandir(frames_dir) as it:
+            transect_dirs = [entry.name for entry in it if entry.is_dir()]
     
     if not transect_dirs:
         logging.error(f"No model directories found in {frames_dir}")
         return
     
+    # Load tracking status for all models once
+    all_status = get_all_transect_status()
+    
     # Filter for unprocessed transects
     unprocessed_transects = []
     for transect_id in transect_dirs:
-        status = get_transect_status(transect_id)
+        status = all_status.get(transect_id, {})
         if status.get("Step 1 complete", "False") != "True":
             unprocessed_transects.append(transect_id)
     
@@ -431,6 +520,9 @@ def main():
     
     logging.info(f"Found {len(unprocessed_transects)} models to process")
     
+    # Resolve Metashape settings up front so a misspelled name fails before any processing
+    metashape_options()
+    
     # Process in completely isolated batches
     timestamp = datetime.datetime.now().strftime("%Y%m%d")
     
@@ -455,16 +547,28 @@ def main():
         logging.info(f"Starting batch {batch_num} of {len(batches)}")
         
         # Process the batch (completely isolated from other batches)
-        batch_results = process_batch(batch, batch_num, timestamp)
+        batch_results = process_batch(batch, batch_num, timestamp, all_status)
         
         # Merge results
         batch_mapping.update(batch_results)
         
         # Force garbage collection
-        import gc
         gc.collect()
     
     logging.info("Step 1 isolated processing complete")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Create project directories before logging writes into them
+    init_project()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step1_isolated_{PROJECT_NAME}_{TIMESTAMP}.log")),
+            logging.StreamHandler()
+        ]
+    )
+    
+    main()
@@ -15,21 +15,13 @@ from config import (
     PROJECT_NAME,
     get_tracking_files,
     update_tracking,
+    flush_tracking,
     PARAMS,
-    TIMESTAMP
+    TIMESTAMP,
+    init_project
 )
 import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step2_{PROJECT_NAME}_{TIMESTAMP}.log")),
-        logging.StreamHandler()
-    ]
-)
-
 def main():
     """Main function to manage chunks across projects."""
     # Open the existing document if running in Metashape GUI
@@ -166,7 +158,23 @@ def main():
         dest_doc.save(dest_project_path)
         logging.info(f"Chunks appended to {destination} and saved.")
     
+    # Write any tracking updates still queued from the run
+    flush_tracking()
+    
     logging.info("All chunk management operations completed successfully.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Create project directories before logging writes into them
+    init_project()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step2_{PROJECT_NAME}_{TIMESTAMP}.log")),
+            logging.StreamHandler()
+        ]
+    )
+    
+    main()
@@ -19,22 +19,14 @@ from config import (
     PROJECT_NAME,
     get_tracking_files,
     update_tracking,
+    flush_tracking,
     PARAMS,
-    get_transect_status
+    get_transect_status,
+    init_project
 )
 import datetime
 from utility.file_naming import get_export_paths, clean_model_id
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step3_{PROJECT_NAME}.log")),
-        logging.StreamHandler()
-    ]
-)
-
 def find_marker_by_label(chunk, label):
     """
     Find a marker in the chunk by its label.
@@ -558,7 +550,23 @@ def main():
         else:
             logging.error(f"PSX output directory not found: {psx_dir_path}")
     
+    # Write any tracking updates still queued from the run
+    flush_tracking()
+    
     logging.info("All model processing and exports completed successfully.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Create project directories before logging writes into them
+    init_project()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step3_{PROJECT_NAME}.log")),
+            logging.StreamHandler()
+        ]
+    )
+    
+    main()
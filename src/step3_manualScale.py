@@ -25,22 +25,14 @@ from config import (
     PROJECT_NAME,
     get_tracking_files,
     update_tracking,
+    flush_tracking,
     PARAMS,
-    get_transect_status
+    get_transect_status,
+    init_project
 )
 import datetime
 from utility.file_naming import get_export_paths, clean_model_id
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step3_manualScale_{PROJECT_NAME}.log")),
-        logging.StreamHandler()
-    ]
-)
-
 def check_existing_scale_bars(chunk):
     """
     Check if scale bars already exist in the chunk.
@@ -529,10 +521,26 @@ def main():
         else:
             logging.error(f"PSX output directory not found: {psx_dir_path}")
     
+    # Write any tracking updates still queued from the run
+    flush_tracking()
+    
     logging.info("="*60)
     logging.info("STEP 3 MANUAL SCALE: All processing completed successfully.")
     logging.info("Outputs use standardized naming identical to automatic workflow.")
     logging.info("="*60)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Create project directories before logging writes into them
+    init_project()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step3_manualScale_{PROJECT_NAME}.log")),
+            logging.StreamHandler()
+        ]
+    )
+    
+    main()
@@ -10,21 +10,11 @@ This script:
 import os
 import logging
 import Metashape
-import pandas as pd
 from config import (
     DIRECTORIES,
     PROJECT_NAME,
-    METASHAPE_DEFAULTS
-)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step4_{PROJECT_NAME}.log")),
-        logging.StreamHandler()
-    ]
+    METASHAPE_DEFAULTS,
+    init_project
 )
 
 def decimate_and_upload(chunk, decimate_vertices, sketchfab_settings):
@@ -249,4 +239,17 @@ def main():
     logging.info("Final exports and web publishing completed successfully.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Create project directories before logging writes into them
+    init_project()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(DIRECTORIES["logs"], f"step4_{PROJECT_NAME}.log")),
+            logging.StreamHandler()
+        ]
+    )
+    
+    main()
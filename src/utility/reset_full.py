@@ -6,21 +6,133 @@ This script resets a project directory to BEFORE Step 0 by emptying
 processing/ and output/ directories while keeping the folder structure and 
 preserving video_source/ and analysis_params.yaml.
 
-Usage: python src/utility/reset_full.py [project_directory]
+Usage: python src/utility/reset_full.py [project_directory] [--verbose]
 """
 
 import os
 import sys
 import shutil
-import glob
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-def reset_complete(project_dir):
+# Number of buffered --verbose lines written to stdout at a time
+VERBOSE_FLUSH_EVERY = 1000
+
+def _write_lines(lines):
+    """Write buffered output lines in a single call and clear the buffer."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    lines.clear()
+
+# Native `rm` is used for subtrees when available; otherwise each target is removed in one rmtree walk
+USE_NATIVE_RM = os.name == "posix" and shutil.which("rm") is not None
+
+def _remove_entry(entry, dir_fd=None):
+    """
+    Remove a single directory entry, handing whole subtrees to a native `rm -rf`.
+    
+    Args:
+        entry (os.DirEntry): File or directory to remove
+        dir_fd (int): Open descriptor of the entry's parent, so files are unlinked by name
+    """
+    if entry.is_dir(follow_symlinks=False):
+        result = subprocess.run(["rm", "-rf", "--", entry.path], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise OSError(result.stderr.strip() or f"rm exited with status {result.returncode}")
+    elif dir_fd is not None:
+        os.unlink(entry.name, dir_fd=dir_fd)
+    else:
+        os.unlink(entry.path)
+
+def _recreate_dir(path):
+    """
+    Empty a directory by removing it in a single rmtree walk and recreating the empty shell.
+    
+    Args:
+        path (str): Directory to empty
+    """
+    try:
+        shutil.rmtree(path)
+    finally:
+        # A partial rmtree may have removed the directory itself
+        os.makedirs(path, exist_ok=True)
+
+def _empty_dirs(paths, verbose=False):
+    """
+    Remove all contents of the given directories but keep the directories themselves.
+    
+    With a native `rm`, top-level subtrees are removed in parallel, since unlinks
+    in different parent directories do not serialize on each other. Without it,
+    each directory is removed whole and recreated empty.
+    
+    Args:
+        paths (list[str]): Directories to empty
+        verbose (bool): List each top-level item as it is removed
+    
+    Returns:
+        list: (path, error) tuples for items that could not be removed
+    """
+    entries = []
+    for path in paths:
+        with os.scandir(path) as it:
+            entries.extend((path, entry) for entry in it)
+    
+    errors = []
+    if not entries:
+        return errors
+    
+    removed = []
+    if USE_NATIVE_RM:
+        # Unlink files relative to an open parent fd to skip re-resolving the full path each time
+        dir_fds = {}
+        try:
+            if os.unlink in os.supports_dir_fd:
+                for path in paths:
+                    dir_fds[path] = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                futures = {executor.submit(_remove_entry, entry, dir_fds.get(path)): entry
+                           for path, entry in entries}
+                for future in as_completed(futures):
+                    entry = futures[future]
+                    try:
+                        future.result()
+                        removed.append(entry)
+                    except Exception as e:
+                        errors.append((entry.path, e))
+        finally:
+            for fd in dir_fds.values():
+                os.close(fd)
+    else:
+        for path in paths:
+            try:
+                _recreate_dir(path)
+            except Exception as e:
+                errors.append((path, e))
+        failed = {path for path, _ in errors}
+        removed = [entry for path, entry in entries if path not in failed]
+    
+    removed_dirs = sum(1 for entry in removed if entry.is_dir(follow_symlinks=False))
+    if verbose:
+        # Buffer names so large trees don't cost one console write per item
+        batch = []
+        for entry in removed:
+            batch.append(f"    ✅ Removed: {entry.path}")
+            if len(batch) >= VERBOSE_FLUSH_EVERY:
+                _write_lines(batch)
+        if batch:
+            _write_lines(batch)
+    print(f"    ✅ Removed {len(removed) - removed_dirs} files, {removed_dirs} subdirs")
+    
+    return errors
+
+def reset_complete(project_dir, verbose=False):
     """
     Complete project reset to BEFORE Step 0 - empties processing/ and output/ directories.
     
     Args:
         project_dir (str): Path to the project directory
+        verbose (bool): Print each removed item
     """
     print(f"🔄 COMPLETE PROJECT RESET to BEFORE Step 0")
     print(f"📁 Project: {project_dir}")
@@ -32,10 +144,10 @@ def reset_complete(project_dir):
         "output"
     ]
     
-    # Files/patterns in the project root to remove
-    files_to_remove = [
-        "*.csv"
-    ]
+    # File extensions in the project root to remove
+    file_suffixes_to_remove = (
+        ".csv",
+    )
     
     # Essential items to KEEP (relative to project root)
     items_to_keep = [
@@ -53,14 +165,18 @@ def reset_complete(project_dir):
         else:
             print(f"    - {target_path} (not found - will create empty)")
     
+    # Scan the project root once; the same entries are used for the plan and the removal
+    with os.scandir(project_dir) as it:
+        files_to_remove = [entry for entry in it
+                           if entry.is_file() and entry.name.endswith(file_suffixes_to_remove)]
+    
     print("\n  Will REMOVE these files from project root:")
-    for pattern in files_to_remove:
-        matches = glob.glob(os.path.join(project_dir, pattern))
-        if matches:
-            for match in matches:
-                print(f"    ✓ {os.path.basename(match)}")
-        else:
-            print(f"    - {pattern} (none found)")
+    if files_to_remove:
+        for entry in files_to_remove:
+            print(f"    ✓ {entry.name}")
+    else:
+        for suffix in file_suffixes_to_remove:
+            print(f"    - *{suffix} (none found)")
     
     print("\n  Will KEEP these items UNTOUCHED:")
     for item in items_to_keep:
@@ -82,24 +198,13 @@ def reset_complete(project_dir):
     print("\n🗑️  EXECUTING COMPLETE RESET...")
     
     # Empty specified directories but keep the directory structure
+    dirs_to_clear = []
     for dir_name in dirs_to_empty:
         target_path = os.path.join(project_dir, dir_name)
         
         if os.path.isdir(target_path):
             print(f"🗑️  Emptying directory: {target_path}")
-            try:
-                # Remove all contents but keep the directory
-                for item in os.listdir(target_path):
-                    item_path = os.path.join(target_path, item)
-                    if os.path.isdir(item_path):
-                        shutil.rmtree(item_path)
-                        print(f"    ✅ Removed subdirectory: {item}")
-                    else:
-                        os.remove(item_path)
-                        print(f"    ✅ Removed file: {item}")
-                print(f"    📁 Kept empty directory: {target_path}")
-            except Exception as e:
-                print(f"    ⚠️  Error emptying {target_path}: {e}")
+            dirs_to_clear.append(target_path)
         else:
             # Create the directory if it doesn't exist
             print(f"📁 Creating empty directory: {target_path}")
@@ -109,25 +214,36 @@ def reset_complete(project_dir):
             except Exception as e:
                 print(f"    ⚠️  Error creating {target_path}: {e}")
     
+    # Remove all contents but keep the directories
+    try:
+        errors = _empty_dirs(dirs_to_clear, verbose=verbose)
+    except Exception as e:
+        errors = [(", ".join(dirs_to_clear), e)]
+    
+    if errors:
+        print(f"    ⚠️  {len(errors)} item(s) could not be removed:")
+        for path, e in errors:
+            print(f"        {path}: {e}")
+    for target_path in dirs_to_clear:
+        if os.path.isdir(target_path) and not os.listdir(target_path):
+            print(f"    📁 Kept empty directory: {target_path}")
+        else:
+            print(f"    ⚠️  Directory not left empty: {target_path}")
+    
     # Remove specific CSV files
     project_name = os.path.basename(project_dir.rstrip('/'))
     status_csv_filename = f"status_{project_name}.csv"
-    specific_csv_path = os.path.join(project_dir, status_csv_filename)
     
-    print(f"🗑️  Looking for tracking file: {specific_csv_path}")
-    if os.path.exists(specific_csv_path):
-        os.remove(specific_csv_path)
-        print(f"    ✅ Removed: {status_csv_filename}")
-    else:
+    print(f"🗑️  Looking for tracking file: {os.path.join(project_dir, status_csv_filename)}")
+    if not any(entry.name == status_csv_filename for entry in files_to_remove):
         print(f"    ℹ️  Not found: {status_csv_filename}")
     
-    # Remove other CSV files matching patterns
-    for pattern in files_to_remove:
-        matches = glob.glob(os.path.join(project_dir, pattern))
-        for match in matches:
-            if os.path.basename(match) != status_csv_filename:  # Don't double-delete
-                os.remove(match)
-                print(f"    ✅ Removed: {os.path.basename(match)}")
+    for entry in files_to_remove:
+        try:
+            os.unlink(entry.path)
+            print(f"    ✅ Removed: {entry.name}")
+        except OSError as e:
+            print(f"    ⚠️  Error removing {entry.name}: {e}")
     
     print("\n🎯 COMPLETE PROJECT RESET FINISHED!")
     print("✅ All processing and output data cleared")
@@ -140,8 +256,11 @@ def reset_complete(project_dir):
 
 def main():
     """Main function"""
-    if len(sys.argv) > 1:
-        project_dir = sys.argv[1].strip().strip('\'\"').rstrip('/')
+    verbose = "--verbose" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--verbose"]
+    
+    if args:
+        project_dir = args[0].strip().strip('\'\"').rstrip('/')
     else:
         print("Please enter the absolute path to your project directory:")
         project_dir = input("Project directory: ").strip().strip('\'\"').rstrip('/')
@@ -150,7 +269,7 @@ def main():
         print(f"❌ ERROR: Project directory not found: {project_dir}")
         return 1
     
-    success = reset_complete(project_dir)
+    success = reset_complete(project_dir, verbose=verbose)
     return 0 if success else 1
 
 if __name__ == "__main__":
@@ -82,14 +82,14 @@ def reset_after_step1(project_dir):
         print(f"🗑️  Clearing output directory: {output_dir}")
         try:
             # Remove all contents but keep the directory
-            for item in os.listdir(output_dir):
-                item_path = os.path.join(output_dir, item)
-                if os.path.isdir(item_path):
-                    shutil.rmtree(item_path)
-                    print(f"    ✅ Removed subdirectory: {item}")
-                else:
-                    os.remove(item_path)
-                    print(f"    ✅ Removed file: {item}")
+            with os.scandir(output_dir) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                        print(f"    ✅ Removed subdirectory: {entry.name}")
+                    else:
+                        os.unlink(entry.path)
+                        print(f"    ✅ Removed file: {entry.name}")
         except Exception as e:
             print(f"    ⚠️  Error clearing {output_dir}: {e}")
     else:
@@ -0,0 +1,151 @@
+"""
+Tests for the tracking journal and flush in src/config.py
+
+Run from the repository root with: python -m unittest discover tests
+"""
+
+import atexit
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+
+class TrackingFlushTest(unittest.TestCase):
+    def setUp(self):
+        self.project_dir = tempfile.mkdtemp(prefix="tracking_test_")
+        shutil.copy(os.path.join(REPO_ROOT, "analysis_params.yaml"), self.project_dir)
+        argv = mock.patch.object(sys, "argv", ["test", self.project_dir])
+        argv.start()
+        self.addCleanup(argv.stop)
+
+        # Fresh module state (pending updates, journal handle) for every test
+        sys.modules.pop("config", None)
+        self.config = importlib.import_module("config")
+        atexit.unregister(self.config._flush_tracking_at_exit)
+        self.config.initialize_tracking("T1")
+
+    def tearDown(self):
+        self.config._close_journal()
+        sys.modules.pop("config", None)
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+
+    def test_failed_flush_is_retried_by_next_flush(self):
+        config = self.config
+        config.update_tracking("T1", {"Status": "Step 0 complete"})
+
+        with mock.patch.object(config, "_write_tracking_rows", side_effect=OSError("disk full")):
+            config.flush_tracking()
+        self.assertTrue(os.path.exists(config.get_tracking_journal()))
+        self.assertNotEqual(config._load_tracking_status()["T1"].get("Status"), "Step 0 complete")
+
+        config.flush_tracking()
+        self.assertEqual(config._load_tracking_status()["T1"].get("Status"), "Step 0 complete")
+        self.assertFalse(os.path.exists(config.get_tracking_journal()))
+
+    def test_journal_is_replayed_after_exit_without_flush(self):
+        config = self.config
+        config.update_tracking("T1", {"Status": "Step 0 complete"})
+        config._close_journal()
+
+        # A new process starts with nothing pending and recovers the update from the journal
+        sys.modules.pop("config", None)
+        config = self.config = importlib.import_module("config")
+        atexit.unregister(config._flush_tracking_at_exit)
+        config.flush_tracking()
+        self.assertEqual(config._load_tracking_status()["T1"].get("Status"), "Step 0 complete")
+        self.assertFalse(os.path.exists(config.get_tracking_journal()))
+
+    def test_redirected_tracking_never_touches_files(self):
+        config = self.config
+        config.update_tracking("T1", {"Status": "Step 0 complete"})
+        config.flush_tracking()
+        before = os.stat(config.get_tracking_file()).st_mtime_ns
+
+        received = []
+        config.redirect_tracking(lambda model_id, data: received.append((model_id, data)))
+        config.update_tracking("T1", {"Status": "Step 1 complete"})
+        config.flush_tracking()
+
+        self.assertEqual(received, [("T1", {"Status": "Step 1 complete"})])
+        self.assertEqual(os.stat(config.get_tracking_file()).st_mtime_ns, before)
+        self.assertFalse(os.path.exists(config.get_tracking_journal()))
+
+    def test_unchanged_update_is_not_journaled(self):
+        config = self.config
+        config.update_tracking("T1", {"Status": "Step 0 complete"})
+        config.flush_tracking()
+
+        config.update_tracking("T1", {"Status": "Step 0 complete"})
+        self.assertEqual(config._pending, {})
+        self.assertFalse(os.path.exists(config.get_tracking_journal()))
+
+    def test_flush_reuses_rows_until_file_changes(self):
+        config = self.config
+        config.update_tracking("T1", {"Status": "Step 0 complete"})
+        config.flush_tracking()
+
+        with mock.patch.object(config, "_read_tracking_rows", wraps=config._read_tracking_rows) as read_rows:
+            config.update_tracking("T1", {"Status": "Step 1 complete"})
+            config.flush_tracking()
+            read_rows.assert_not_called()
+
+            # A write by another process invalidates the cached rows
+            with open(config.get_tracking_file(), "a", newline="", encoding="utf-8") as f:
+                f.write("T3\n")
+            config.update_tracking("T1", {"Status": "Step 2 complete"})
+            config.flush_tracking()
+            read_rows.assert_called_once()
+
+        status = config._load_tracking_status()
+        self.assertEqual(status["T1"].get("Status"), "Step 2 complete")
+        self.assertIn("T3", status)
+
+    def test_status_is_reparsed_only_after_file_changes(self):
+        config = self.config
+        config.update_tracking("T1", {"Status": "Step 0 complete"})
+        config.flush_tracking()
+
+        with mock.patch.object(config, "_open_tracking", wraps=config._open_tracking) as open_tracking:
+            first = config._load_tracking_status()
+            self.assertIs(config._load_tracking_status(), first)
+            self.assertEqual(open_tracking.call_count, 1)
+
+            config.update_tracking("T1", {"Status": "Step 1 complete"})
+            config.flush_tracking()
+            self.assertEqual(config._load_tracking_status()["T1"].get("Status"), "Step 1 complete")
+
+    def test_settings_are_resolved_on_first_access(self):
+        # Importing config must not touch the project directory
+        with mock.patch.object(sys, "argv", ["test", os.path.join(self.project_dir, "missing")]):
+            sys.modules.pop("config", None)
+            config = importlib.import_module("config")
+            atexit.unregister(config._flush_tracking_at_exit)
+            self.assertFalse(config._config_loaded())
+            with self.assertRaises(FileNotFoundError):
+                config.PARAMS
+
+        sys.modules.pop("config", None)
+        from config import PROJECT_NAME
+        self.assertEqual(PROJECT_NAME, os.path.basename(self.project_dir))
+        atexit.unregister(sys.modules["config"]._flush_tracking_at_exit)
+
+    def test_rejected_update_still_adds_missing_row(self):
+        config = self.config
+        config.update_tracking("T2", {"Status": "Error in frame extraction", "Not a column": "x"})
+        config.flush_tracking()
+
+        status = config._load_tracking_status()
+        self.assertIn("T2", status)
+        self.assertNotEqual(status["T2"].get("Status"), "Error in frame extraction")
+        self.assertFalse(os.path.exists(config.get_tracking_journal()))
+
+
+if __name__ == "__main__":
+    unittest.main()